@@ -1,13 +1,21 @@
 import itertools
+import math
 import random
 
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+
+# Frontier components with fewer cells are enumerated by the AI itself,
+# as sending them to a worker process costs more than enumerating them
+PARALLEL_CELLS = 16
+
 
 class Minesweeper():
     """
     Minesweeper game representation
     """
 
-    def __init__(self, height=8, width=8, mines=8):
+    def __init__(self, height=8, width=8, mines=8, safe=None):
 
         # Set initial width, height, and number of mines
         self.height = height
@@ -15,20 +23,41 @@ class Minesweeper():
         self.mines = set()
 
         # Initialize an empty field with no mines
-        self.board = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                row.append(False)
-            self.board.append(row)
+        self.board = [[False] * width for _ in range(height)]
+
+        if not 0 <= mines <= height * width:
+            raise ValueError(
+                f"cannot place {mines} mines on a {height}x{width} board"
+            )
+
+        # Keep the first click, and its neighbors if possible, free of
+        # mines, unless every cell must hold one
+        excluded = set()
+        if safe is not None:
+            excluded = self.neighbors(safe) | {safe}
+            if height * width - len(excluded) < mines:
+                excluded = {safe}
+            if height * width - len(excluded) < mines:
+                excluded = set()
+        excluded = set(i * width + j for i, j in excluded)
+
+        # Add mines uniformly at random: a random sample of the cells
+        # large enough to still hold `mines` cells once excluded ones
+        # are dropped
+        sample = random.sample(range(height * width), mines + len(excluded))
+        for n in [n for n in sample if n not in excluded][:mines]:
+            i, j = divmod(n, width)
+            self.mines.add((i, j))
+            self.board[i][j] = True
+
+        # Count mines around every cell once, from the mines themselves
+        self.counts = [[0] * width for _ in range(height)]
+        for mine in self.mines:
+            for i, j in self.neighbors(mine):
+                self.counts[i][j] += 1
 
-        # Add mines randomly
-        while len(self.mines) != mines:
-            i = random.randrange(height)
-            j = random.randrange(width)
-            if not self.board[i][j]:
-                self.mines.add((i, j))
-                self.board[i][j] = True
+        # Cells revealed so far with `reveal`
+        self.revealed = set()
 
         # At first, player has found no mines
         self.mines_found = set()
@@ -52,30 +81,47 @@ class Minesweeper():
         i, j = cell
         return self.board[i][j]
 
+    def neighbors(self, cell):
+        """
+        Returns the set of cells within one row and column
+        of a given cell, not including the cell itself.
+        """
+        i, j = cell
+        return set(
+            (row, col)
+            for row in range(max(i - 1, 0), min(i + 2, self.height))
+            for col in range(max(j - 1, 0), min(j + 2, self.width))
+            if (row, col) != cell
+        )
+
     def nearby_mines(self, cell):
         """
         Returns the number of mines that are
         within one row and column of a given cell,
         not including the cell itself.
         """
+        i, j = cell
+        return self.counts[i][j]
 
-        # Keep count of nearby mines
-        count = 0
-
-        # Loop over all cells within one row and column
-        for i in range(cell[0] - 1, cell[0] + 2):
-            for j in range(cell[1] - 1, cell[1] + 2):
-
-                # Ignore the cell itself
-                if (i, j) == cell:
-                    continue
-
-                # Update count if cell in bounds and is mine
-                if 0 <= i < self.height and 0 <= j < self.width:
-                    if self.board[i][j]:
-                        count += 1
-
-        return count
+    def reveal(self, cell):
+        """
+        Reveals a safe cell and, if no mine is nearby, every cell
+        reachable through cells with no nearby mines.
+        Returns a dictionary mapping each newly revealed cell
+        to its number of nearby mines.
+        """
+        revealed = dict()
+        frontier = [cell]
+        while frontier:
+            current = frontier.pop()
+            if current in self.revealed:
+                continue
+            self.revealed.add(current)
+            count = self.nearby_mines(current)
+            revealed[current] = count
+            if count == 0:
+                frontier.extend(self.neighbors(current) - self.revealed)
+        return revealed
 
     def won(self):
         """
@@ -159,17 +205,235 @@ class Sentence():
         self.safes.add(cell)
         self.check_known_cells()
 
+def to_bits(cells, width):
+    """
+    Return the integer whose bit `i * width + j` is set
+    for every cell (i, j) in `cells`.
+    """
+    mask = 0
+    for i, j in cells:
+        mask |= 1 << (i * width + j)
+    return mask
+
+
+def from_bits(mask, width):
+    """
+    Return the set of cells whose bits are set in `mask`.
+    """
+    cells = set()
+    while mask:
+        low = mask & -mask
+        cells.add(divmod(low.bit_length() - 1, width))
+        mask ^= low
+    return cells
+
+
+class BitSentence():
+    """
+    Logical statement about a Minesweeper game, storing its cells,
+    safes and mines as bits of an integer (see `to_bits`), so that
+    subset tests, differences and counts are single integer operations.
+    """
+
+    def __init__(self, cells, count, width):
+        self.cells = cells
+        self.count = count
+        self.width = width
+        self.safes = 0
+        self.mines = 0
+        self.check_known_cells()
+
+    def __eq__(self, other):
+        return self.cells == other.cells and self.count == other.count
+
+    def __str__(self):
+        return f"{from_bits(self.cells, self.width)} = {self.count}"
+
+    def cells_data(self):
+        return (self.cells, self.count)
+
+    def unknown_cells(self):
+        return self.cells & ~(self.mines | self.safes)
+
+    def can_be_deleted(self):
+        return not self.unknown_cells()
+
+    def has_single_cell(self):
+        return self.cells & (self.cells - 1) == 0
+
+    def current_unknown_data(self):
+        return (self.unknown_cells(), self.count - self.mines.bit_count())
+
+    def check_known_cells(self):
+        uCells, uCount = self.current_unknown_data()
+        if uCells and uCount == 0:
+            self.safes |= uCells
+            uCells, uCount = self.current_unknown_data()
+        if uCells and uCount == uCells.bit_count():
+            self.mines |= uCells
+
+    def known_mines(self):
+        """
+        Returns the set of all cells in self.cells known to be mines.
+        """
+        return from_bits(self.mines, self.width)
+
+    def known_safes(self):
+        """
+        Returns the set of all cells in self.cells known to be safe.
+        """
+        return from_bits(self.safes, self.width)
+
+    def mark_mine(self, cell):
+        """
+        Updates internal knowledge representation given the fact that
+        a cell is known to be a mine.
+        """
+        self.mark_mines(to_bits([cell], self.width))
+
+    def mark_safe(self, cell):
+        """
+        Updates internal knowledge representation given the fact that
+        a cell is known to be safe.
+        """
+        self.mark_safes(to_bits([cell], self.width))
+
+    def mark_mines(self, mask):
+        mask &= self.cells & ~self.mines
+        if mask:
+            self.mines |= mask
+            self.check_known_cells()
+
+    def mark_safes(self, mask):
+        mask &= self.cells & ~self.safes
+        if mask:
+            self.safes |= mask
+            self.check_known_cells()
+
+
+def split_components(constraints):
+    """
+    Split a collection of `(cells, count)` constraints into groups
+    such that no two groups share a cell.
+    Return a list of frozensets of constraints.
+    """
+    by_cell = dict()
+    for constraint in constraints:
+        for cell in constraint[0]:
+            by_cell.setdefault(cell, []).append(constraint)
+
+    components = []
+    seen = set()
+    for constraint in constraints:
+        if constraint in seen:
+            continue
+        seen.add(constraint)
+        group = []
+        frontier = [constraint]
+        while frontier:
+            current = frontier.pop()
+            group.append(current)
+            for cell in current[0]:
+                for other in by_cell[cell]:
+                    if other not in seen:
+                        seen.add(other)
+                        frontier.append(other)
+        components.append(frozenset(group))
+    return components
+
+
+def enumerate_component(constraints):
+    """
+    Enumerate every mine configuration consistent with a group of
+    `(cells, count)` constraints, using backtracking.
+
+    Return a tuple `(cells, solutions)` where `solutions` maps a number
+    of mines `k` to a pair `[total, per_cell]`: how many configurations
+    place exactly `k` mines, and in how many of those each cell of
+    `cells` is a mine.
+    """
+    constraints = sorted(constraints, key=lambda c: (len(c[0]), sorted(c[0])))
+
+    # Visit cells constraint by constraint, so that constraints
+    # are closed (and pruned) as early as possible
+    cells = []
+    index = dict()
+    for constraint_cells, _ in constraints:
+        for cell in sorted(constraint_cells):
+            if cell not in index:
+                index[cell] = len(cells)
+                cells.append(cell)
+
+    watching = [[] for _ in cells]
+    remaining = []
+    free = []
+    for c, (constraint_cells, count) in enumerate(constraints):
+        remaining.append(count)
+        free.append(len(constraint_cells))
+        for cell in constraint_cells:
+            watching[index[cell]].append(c)
+
+    values = [0] * len(cells)
+    solutions = dict()
+
+    def place(n, mines):
+        if n == len(cells):
+            if mines not in solutions:
+                solutions[mines] = [0, [0] * len(cells)]
+            solution = solutions[mines]
+            solution[0] += 1
+            for i, value in enumerate(values):
+                solution[1][i] += value
+            return
+        for value in (0, 1):
+            feasible = True
+            for c in watching[n]:
+                remaining[c] -= value
+                free[c] -= 1
+                if remaining[c] < 0 or remaining[c] > free[c]:
+                    feasible = False
+            if feasible:
+                values[n] = value
+                place(n + 1, mines + value)
+            for c in watching[n]:
+                remaining[c] += value
+                free[c] += 1
+
+    place(0, 0)
+    return tuple(cells), solutions
+
+
+def convolve(a, b):
+    """
+    Combine two distributions mapping a number of mines to a number
+    of configurations.
+    """
+    result = dict()
+    for i, x in a.items():
+        for j, y in b.items():
+            result[i + j] = result.get(i + j, 0) + x * y
+    return result
+
+
 class MinesweeperAI():
     """
     Minesweeper game player
     """
 
-    def __init__(self, height=8, width=8):
+    def __init__(self, height=8, width=8, mines=8, workers=1):
 
         # Set initial height and width
         self.height = height
         self.width = width
 
+        # Total number of mines on the board, used to weigh guesses
+        self.total_mines = mines
+
+        # Processes used to enumerate frontier components, started the
+        # first time they are needed and kept until `close`
+        self.workers = workers
+        self.pool = None
+
         # Keep track of which cells have been clicked on
         self.moves_made = set()
 
@@ -180,6 +444,17 @@ class MinesweeperAI():
         # List of sentences about the game known to be true
         self.knowledge = []
 
+        # Enumerated configurations of the current frontier components
+        self.component_cache = dict()
+
+    def close(self):
+        """
+        Shut down the worker processes, if any were started.
+        """
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
     def mark_mine(self, cell):
         """
         Marks a cell as a mine, and updates all knowledge
@@ -228,12 +503,13 @@ class MinesweeperAI():
         self.mark_safe(cell)
         
         cells = []
+        known = self.moves_made.union(self.safes)
         i,j = cell
         for row in range(i-1, i+2):
             if row < 0 or row > self.height-1:
                 continue
             for col in range(j-1, j+2):
-                if col < 0 or col > self.width - 1 or (row, col) in self.moves_made.union(self.safes):
+                if col < 0 or col > self.width - 1 or (row, col) in known:
                     continue
                 cells.append((row, col))
         if cells:
@@ -315,7 +591,8 @@ class MinesweeperAI():
         i = 0
         j = -1
         cell = (random.randint(0,self.height-1), random.randint(0,self.width-1))
-        while (cell in self.mines.union(self.moves_made)):
+        unavailable = self.mines.union(self.moves_made)
+        while (cell in unavailable):
             if j == self.width-1:
                 i += 1
                 j = -1
@@ -325,3 +602,454 @@ class MinesweeperAI():
             cell = (i, j)
         # print(f"random: {cell}")
         return cell
+
+    def frontier_constraints(self):
+        """
+        Return the set of `(cells, count)` constraints over cells that
+        are neither known to be safe nor known to be mines.
+        """
+        constraints = set()
+        for sentence in self.knowledge:
+            cells = frozenset(sentence.cells - self.mines - self.safes)
+            if cells:
+                count = sentence.count - len(sentence.cells & self.mines)
+                constraints.add((cells, count))
+        return constraints
+
+    def enumerate_components(self, components):
+        """
+        Return the enumerated configurations of each component,
+        reusing the ones already computed in previous moves.
+
+        With several workers, components of at least PARALLEL_CELLS
+        cells are enumerated in parallel. Components that are no longer
+        on the frontier are dropped from the cache.
+        """
+        pending = [c for c in components if c not in self.component_cache]
+        large = [
+            c for c in pending
+            if len(frozenset().union(*(cells for cells, _ in c))) >= PARALLEL_CELLS
+        ]
+        if self.workers > 1 and len(large) > 1:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(self.workers)
+            results = self.pool.map(enumerate_component, large)
+            for component, result in zip(large, results):
+                self.component_cache[component] = result
+        for component in pending:
+            if component not in self.component_cache:
+                self.component_cache[component] = enumerate_component(component)
+
+        self.component_cache = {c: self.component_cache[c] for c in components}
+        return [self.component_cache[c] for c in components]
+
+    def mine_probabilities(self):
+        """
+        Return a dictionary mapping every cell that has not been chosen
+        and is not known to be a mine to the probability that it is one.
+
+        Frontier cells are split into independent components whose
+        configurations are enumerated separately, and every combination
+        is weighed by the number of ways the remaining mines can be
+        placed among the cells no sentence knows anything about.
+        """
+        candidates = set(
+            (i, j) for i in range(self.height) for j in range(self.width)
+        ) - self.moves_made - self.mines
+        results = self.enumerate_components(
+            split_components(self.frontier_constraints())
+        )
+
+        frontier = set()
+        for cells, _ in results:
+            frontier.update(cells)
+        interior = len(candidates - self.safes - frontier)
+        remaining = self.total_mines - len(self.mines)
+
+        distributions = [
+            {k: solution[0] for k, solution in solutions.items()}
+            for _, solutions in results
+        ]
+
+        # Configurations of all components but one, for each component
+        prefix = [{0: 1}]
+        for distribution in distributions:
+            prefix.append(convolve(prefix[-1], distribution))
+        suffix = [{0: 1}]
+        for distribution in reversed(distributions):
+            suffix.append(convolve(suffix[-1], distribution))
+        suffix.reverse()
+        combined = prefix[-1]
+
+        def weight(k):
+            if 0 <= remaining - k <= interior:
+                return math.comb(interior, remaining - k)
+            return 0
+
+        # If the mine count cannot be reconciled, weigh configurations equally
+        total = sum(n * weight(k) for k, n in combined.items())
+        if total == 0:
+            def weight(k):
+                return 1
+            total = sum(combined.values())
+
+        probabilities = {cell: 0.0 for cell in candidates}
+
+        for r, (cells, solutions) in enumerate(results):
+            rest = convolve(prefix[r], suffix[r + 1])
+            for k, (_, per_cell) in solutions.items():
+                w = sum(n * weight(k + j) for j, n in rest.items())
+                if w == 0:
+                    continue
+                for cell, mines in zip(cells, per_cell):
+                    probabilities[cell] += mines * w / total
+
+        if interior:
+            expected = sum(
+                n * weight(k) * max(remaining - k, 0)
+                for k, n in combined.items()
+            ) / total
+            p = min(expected / interior, 1.0)
+            for cell in candidates - self.safes - frontier:
+                probabilities[cell] = p
+
+        return probabilities
+
+    def make_probable_move(self):
+        """
+        Returns the move least likely to be a mine, among cells that
+        have not already been chosen and are not known to be mines.
+        Ties are broken randomly.
+        """
+        probabilities = self.mine_probabilities()
+        if not probabilities:
+            return None
+        lowest = min(probabilities.values())
+        return random.choice(sorted(
+            cell for cell, p in probabilities.items() if p == lowest
+        ))
+
+
+class BitsetMinesweeperAI(MinesweeperAI):
+    """
+    Minesweeper game player keeping its knowledge as BitSentences.
+
+    Known safes and mines are mirrored in `safe_bits` and `mine_bits`,
+    and inference works on the unknown cells of each sentence, so no
+    single-cell sentences need to be kept for known cells.
+    """
+
+    def __init__(self, height=8, width=8, mines=8, workers=1):
+        super().__init__(height, width, mines, workers)
+        self.mine_bits = 0
+        self.safe_bits = 0
+
+        # (cells, count) of every sentence in self.knowledge
+        self.sentence_keys = set()
+
+    def mark_mine(self, cell):
+        self.mark_mines(to_bits([cell], self.width))
+
+    def mark_safe(self, cell):
+        self.mark_safes(to_bits([cell], self.width))
+
+    def mark_mines(self, mask):
+        """
+        Marks every cell of `mask` as a mine, in self.mines
+        and in every sentence of the knowledge base.
+        """
+        mask &= ~self.mine_bits
+        if not mask:
+            return
+        self.mine_bits |= mask
+        self.mines.update(from_bits(mask, self.width))
+        for sentence in self.knowledge:
+            sentence.mark_mines(mask)
+
+    def mark_safes(self, mask):
+        """
+        Marks every cell of `mask` as safe, in self.safes
+        and in every sentence of the knowledge base.
+        """
+        mask &= ~self.safe_bits
+        if not mask:
+            return
+        self.safe_bits |= mask
+        self.safes.update(from_bits(mask, self.width))
+        for sentence in self.knowledge:
+            sentence.mark_safes(mask)
+
+    def new_sentence(self, cells, count):
+        """
+        Return a BitSentence over `cells` that already knows
+        every safe and mine known to the AI.
+        """
+        sentence = BitSentence(cells, count, self.width)
+        sentence.mark_mines(self.mine_bits)
+        sentence.mark_safes(self.safe_bits)
+        return sentence
+
+    def append_to_knowledge(self, sentence):
+        key = sentence.cells_data()
+        if key not in self.sentence_keys:
+            self.sentence_keys.add(key)
+            self.knowledge.append(sentence)
+
+    def mark_known_cells(self):
+        """
+        Marks every safe and mine concluded by any sentence,
+        until no sentence concludes anything new.
+        """
+        while True:
+            safes = 0
+            mines = 0
+            for sentence in self.knowledge:
+                safes |= sentence.safes
+                mines |= sentence.mines
+            safes &= ~self.safe_bits
+            mines &= ~self.mine_bits
+            if not safes and not mines:
+                return
+            self.mark_safes(safes)
+            self.mark_mines(mines)
+
+    def add_knowledge(self, cell, count):
+        self.moves_made.add(cell)
+        self.mark_safe(cell)
+
+        i, j = cell
+        cells = 0
+        for row in range(max(i - 1, 0), min(i + 2, self.height)):
+            for col in range(max(j - 1, 0), min(j + 2, self.width)):
+                cells |= 1 << (row * self.width + col)
+        cells &= ~self.safe_bits
+        if cells:
+            self.append_to_knowledge(self.new_sentence(cells, count))
+        self.mark_known_cells()
+
+        knowledge = list(self.knowledge)
+        for iK in knowledge:
+            for jK in knowledge:
+                if iK is jK:
+                    continue
+                iCells, iCount = iK.current_unknown_data()
+                jCells, jCount = jK.current_unknown_data()
+                self.add_inference(iCells, iCount, jCells, jCount)
+        self.mark_known_cells()
+
+        self.knowledge = [k for k in self.knowledge if not k.can_be_deleted()]
+        self.sentence_keys = set(k.cells_data() for k in self.knowledge)
+
+    def add_inference(self, iCells, iCount, jCells, jCount):
+        if not iCells or iCells & ~jCells:
+            return
+        newCells = jCells & ~iCells
+        if newCells:
+            self.append_to_knowledge(
+                self.new_sentence(newCells, jCount - iCount)
+            )
+
+    def frontier_constraints(self):
+        constraints = set()
+        for sentence in self.knowledge:
+            cells, count = sentence.current_unknown_data()
+            if cells:
+                constraints.add(
+                    (frozenset(from_bits(cells, self.width)), count)
+                )
+        return constraints
+
+
+class LinearMinesweeperAI(MinesweeperAI):
+    """
+    Minesweeper game player treating its knowledge as a linear system
+    over the unknown cells: each revealed cell states that the sum of its
+    unknown neighbors equals its count.
+
+    The system is kept in reduced row echelon form across moves, and
+    since every unknown is either 0 or 1, forced values are read by
+    bounds reasoning from each row, and from each combination of two
+    rows that cancels a cell they share. Reduction spreads a cell over
+    several rows, so a deduction that one row cannot make alone, such
+    as two sentences differing by a few cells, may need two rows again.
+    """
+
+    def __init__(self, height=8, width=8, mines=8, workers=1):
+        super().__init__(height, width, mines, workers)
+
+        # Reduced rows by pivot cell, as [coefficients, constant]:
+        # pivot + sum(coefficients[c] * c) = constant
+        self.rows = dict()
+
+        # Pivots of the rows in which each non-pivot cell appears
+        self.columns = dict()
+
+        # Deduced (cell, value) pairs not yet applied to the system
+        self.pending = []
+
+        # Pivots of the rows changed since they were last combined
+        self.dirty = set()
+
+    def mark_mine(self, cell):
+        self.pending.append((cell, 1))
+        self.propagate()
+
+    def mark_safe(self, cell):
+        self.pending.append((cell, 0))
+        self.propagate()
+
+    def add_knowledge(self, cell, count):
+        self.moves_made.add(cell)
+        self.mark_safe(cell)
+
+        i, j = cell
+        cells = set(
+            (row, col)
+            for row in range(max(i - 1, 0), min(i + 2, self.height))
+            for col in range(max(j - 1, 0), min(j + 2, self.width))
+        ) - self.safes
+        if cells:
+            # Sentences are only kept to weigh guesses
+            self.knowledge.append(Sentence(cells, count))
+            unknown = cells - self.mines
+            self.insert(
+                {c: Fraction(1) for c in unknown},
+                Fraction(count - len(cells) + len(unknown))
+            )
+        self.propagate()
+        while True:
+            self.combine()
+            if not self.pending:
+                break
+            self.propagate()
+
+        self.knowledge = [
+            k for k in self.knowledge if k.cells - self.mines - self.safes
+        ]
+
+    def propagate(self):
+        """
+        Apply deduced values to the system until nothing new is deduced.
+        """
+        while self.pending:
+            cell, value = self.pending.pop()
+            if cell in self.mines or cell in self.safes:
+                continue
+            if value:
+                self.mines.add(cell)
+            else:
+                self.safes.add(cell)
+            self.substitute(cell, value)
+
+    def substitute(self, cell, value):
+        """
+        Replace `cell` by its known `value` in every row of the system.
+        """
+        for pivot in self.columns.pop(cell, ()):
+            row = self.rows[pivot]
+            row[1] -= row[0].pop(cell) * value
+            self.check(pivot)
+
+        # A row losing its pivot is reduced again with a new one
+        if cell in self.rows:
+            coefficients, constant = self.rows.pop(cell)
+            for other in coefficients:
+                self.columns[other].discard(cell)
+            self.insert(coefficients, constant - value)
+
+    def insert(self, coefficients, constant):
+        """
+        Reduce a new row against the system and add it with its own pivot,
+        eliminating that pivot from every other row.
+        """
+        for pivot in [c for c in coefficients if c in self.rows]:
+            factor = coefficients.pop(pivot)
+            pivot_coefficients, pivot_constant = self.rows[pivot]
+            for c, a in pivot_coefficients.items():
+                coefficients[c] = coefficients.get(c, 0) - factor * a
+                if coefficients[c] == 0:
+                    del coefficients[c]
+            constant -= factor * pivot_constant
+        if not coefficients:
+            return
+
+        pivot = min(coefficients)
+        scale = coefficients.pop(pivot)
+        coefficients = {c: a / scale for c, a in coefficients.items()}
+        constant /= scale
+
+        for other in self.columns.pop(pivot, ()):
+            row = self.rows[other]
+            factor = row[0].pop(pivot)
+            for c, a in coefficients.items():
+                row[0][c] = row[0].get(c, 0) - factor * a
+                if row[0][c] == 0:
+                    del row[0][c]
+                    self.columns[c].discard(other)
+                else:
+                    self.columns.setdefault(c, set()).add(other)
+            row[1] -= factor * constant
+            self.check(other)
+
+        self.rows[pivot] = [coefficients, constant]
+        for c in coefficients:
+            self.columns.setdefault(c, set()).add(pivot)
+        self.check(pivot)
+
+    def check(self, pivot):
+        """
+        Queue every cell of a row whose value is forced by the bounds
+        of the row, given that every cell is either 0 or 1.
+        """
+        coefficients, constant = self.rows[pivot]
+        self.bound([(pivot, 1)] + list(coefficients.items()), constant)
+        self.dirty.add(pivot)
+
+    def combine(self):
+        """
+        Queue every cell whose value is forced by the bounds of a
+        combination of two rows that cancels a cell they share, for
+        every pair with a row changed since the last call.
+        """
+        rows = self.rows
+        dirty = [p for p in self.dirty if p in rows]
+        self.dirty = set()
+        seen = set()
+        for p in dirty:
+            for cell, a in rows[p][0].items():
+                for q in self.columns[cell]:
+                    if q == p:
+                        continue
+                    factor = a / rows[q][0][cell]
+                    key = (min(p, q), max(p, q), factor if p < q else 1 / factor)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    terms = {p: 1, q: -factor}
+                    for c, b in rows[p][0].items():
+                        terms[c] = terms.get(c, 0) + b
+                    for c, b in rows[q][0].items():
+                        terms[c] = terms.get(c, 0) - factor * b
+                    self.bound(
+                        [(c, b) for c, b in terms.items() if b != 0],
+                        rows[p][1] - factor * rows[q][1]
+                    )
+
+    def bound(self, terms, constant):
+        """
+        Queue every cell of `terms`, a list of (cell, coefficient) pairs
+        summing to `constant`, whose value is forced by the bounds of
+        the sum, given that every cell is either 0 or 1.
+        """
+        low = sum(a for _, a in terms if a < 0)
+        high = sum(a for _, a in terms if a > 0)
+        for cell, a in terms:
+            # Bounds of the rest of the row, without this cell
+            rest_low = low - min(a, 0)
+            rest_high = high - max(a, 0)
+            can_be_mine = rest_low <= constant - a <= rest_high
+            can_be_safe = rest_low <= constant <= rest_high
+            if can_be_mine and not can_be_safe:
+                self.pending.append((cell, 1))
+            elif can_be_safe and not can_be_mine:
+                self.pending.append((cell, 0))
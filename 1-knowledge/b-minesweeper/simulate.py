@@ -0,0 +1,152 @@
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+from minesweeper import (
+    Minesweeper, MinesweeperAI, BitsetMinesweeperAI, LinearMinesweeperAI
+)
+
+AIS = {
+    "sets": MinesweeperAI,
+    "bitset": BitsetMinesweeperAI,
+    "linear": LinearMinesweeperAI,
+}
+
+# Points of game progress at which knowledge base size is reported
+PROGRESS = [0.1 * k for k in range(1, 11)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play Minesweeper games headlessly with the AI."
+    )
+    parser.add_argument("-n", "--games", type=int, default=100)
+    parser.add_argument("--height", type=int, default=8)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--mines", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--ai", choices=sorted(AIS), default="bitset")
+    parser.add_argument(
+        "--safe-start", action="store_true",
+        help="place mines after the first move, away from it"
+    )
+    parser.add_argument(
+        "--flood-fill", action="store_true",
+        help="reveal whole regions with no nearby mines at once"
+    )
+    parser.add_argument(
+        "--min-win-rate", type=float, default=None,
+        help="exit with an error if the win rate is below this value"
+    )
+    args = parser.parse_args()
+
+    games = [
+        (
+            args.ai, args.height, args.width, args.mines, args.seed + n,
+            args.safe_start, args.flood_fill
+        )
+        for n in range(args.games)
+    ]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as pool:
+        results = list(pool.map(play, games, chunksize=4))
+    elapsed = time.perf_counter() - start
+
+    report(results, elapsed)
+    if args.min_win_rate is not None:
+        win_rate = sum(r["won"] for r in results) / len(results)
+        if win_rate < args.min_win_rate:
+            sys.exit(f"Win rate {win_rate:.3f} below {args.min_win_rate}")
+
+
+def play(game):
+    """
+    Play a single game of Minesweeper with the AI.
+
+    `game` is a tuple `(ai, height, width, mines, seed, safe_start,
+    flood_fill)`. Return a dictionary with whether the game was won,
+    the number of moves, the duration of every `add_knowledge` call,
+    and the size of the knowledge base after each of them.
+    """
+    ai_name, height, width, mines, seed, safe_start, flood_fill = game
+    random.seed(seed)
+    board = None
+    if not safe_start:
+        board = Minesweeper(height=height, width=width, mines=mines)
+    ai = AIS[ai_name](height=height, width=width, mines=mines)
+
+    moves = 0
+    times = []
+    sizes = []
+    won = False
+    while True:
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_probable_move()
+        if move is None:
+            break
+        if board is None:
+            board = Minesweeper(
+                height=height, width=width, mines=mines, safe=move
+            )
+        moves += 1
+        if board.is_mine(move):
+            break
+
+        if flood_fill:
+            revealed = board.reveal(move)
+        else:
+            revealed = {move: board.nearby_mines(move)}
+        for cell, count in revealed.items():
+            start = time.perf_counter()
+            ai.add_knowledge(cell, count)
+            times.append(time.perf_counter() - start)
+            sizes.append(len(ai.knowledge))
+
+        if len(ai.moves_made) == height * width - mines:
+            won = True
+            break
+
+    return {
+        "won": won,
+        "moves": moves,
+        "times": times,
+        "sizes": sizes,
+    }
+
+
+def report(results, elapsed):
+    """
+    Print a summary of the results of many games.
+    """
+    wins = sum(r["won"] for r in results)
+    n = len(results)
+    times = [t for r in results for t in r["times"]]
+    sizes = [s for r in results for s in r["sizes"]]
+
+    print(f"Games: {n} in {elapsed:.2f}s")
+    print(f"Win rate: {wins / n:.3f} ({wins}/{n})")
+    print(f"Moves per game: {statistics.mean(r['moves'] for r in results):.1f}")
+    if times:
+        print(
+            f"add_knowledge: {1000 * statistics.mean(times):.3f}ms mean, "
+            f"{1000 * max(times):.3f}ms max over {len(times)} calls"
+        )
+    if sizes:
+        print(f"Knowledge base: {statistics.mean(sizes):.1f} mean, {max(sizes)} max")
+        print("Knowledge base by game progress:")
+        for progress in PROGRESS:
+            at = [
+                r["sizes"][max(round(progress * len(r["sizes"])) - 1, 0)]
+                for r in results if r["sizes"]
+            ]
+            print(f"  {progress:4.0%}: {statistics.mean(at):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import argparse
+import json
+import numpy as np
+import os
+import tempfile
+import time
+
+from pagerank import (
+    DAMPING, SAMPLES, SOLVERS, crawl, crawl_graph, iterate_pagerank,
+    sample_pagerank, walk_pagerank
+)
+from synthetic import power_law_graph, write_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time crawling, sampling and iterating PageRank."
+    )
+    parser.add_argument("corpora", nargs="*", default=[
+        "corpus0", "corpus1", "corpus2"
+    ])
+    parser.add_argument(
+        "--html", type=int, nargs="*", default=[1000, 10000],
+        help="sizes of synthetic HTML corpora to crawl"
+    )
+    parser.add_argument(
+        "--graphs", type=int, nargs="*", default=[1_000_000],
+        help="sizes of synthetic graphs to solve without crawling"
+    )
+    parser.add_argument("--degree", type=float, default=8)
+    parser.add_argument("--dangling", type=float, default=0.1)
+    parser.add_argument("--components", type=int, default=1)
+    parser.add_argument("--samples", type=int, default=SAMPLES)
+    parser.add_argument("--tolerance", type=float, default=1e-8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--json", action="store_true",
+        help="print one JSON object per measurement"
+    )
+    args = parser.parse_args()
+
+    records = []
+    with tempfile.TemporaryDirectory() as scratch:
+        corpora = list(args.corpora)
+        for size in args.html:
+            directory = os.path.join(scratch, f"power-law-{size}")
+            write_corpus(synthetic(size, args), directory)
+            corpora.append(directory)
+        for directory in corpora:
+            records.extend(benchmark_corpus(directory, args))
+
+    for size in args.graphs:
+        graph = synthetic(size, args)
+        records.extend(benchmark_graph(f"power-law-{size}", graph, args))
+
+    if args.json:
+        for record in records:
+            print(json.dumps(record))
+    else:
+        print_table(records)
+
+
+def synthetic(size, args):
+    return power_law_graph(
+        size, args.degree, dangling=args.dangling,
+        components=args.components, rng=args.seed
+    )
+
+
+def timed(f, *args):
+    """
+    Return the result of `f(*args)` and the seconds it took.
+    """
+    start = time.perf_counter()
+    result = f(*args)
+    return result, time.perf_counter() - start
+
+
+def benchmark_corpus(directory, args):
+    """
+    Time crawling a directory of HTML pages and computing PageRank from
+    its dictionary of links, then every measurement of `benchmark_graph`.
+    Sampling is compared with iteration by the L1 distance of the ranks.
+    """
+    name = os.path.basename(directory)
+    graph, graph_seconds = timed(crawl_graph, directory)
+    corpus, crawl_seconds = timed(crawl, directory)
+    reference, iterate_seconds = timed(iterate_pagerank, corpus, DAMPING)
+    sample, sample_seconds = timed(
+        sample_pagerank, corpus, DAMPING, args.samples
+    )
+
+    info = {"corpus": name, "pages": graph.n, "links": len(graph.targets)}
+    return [
+        dict(info, task="crawl", seconds=crawl_seconds),
+        dict(info, task="crawl_graph", seconds=graph_seconds),
+        dict(info, task="iterate_pagerank", seconds=iterate_seconds),
+        dict(
+            info, task="sample_pagerank", seconds=sample_seconds,
+            samples=args.samples,
+            error=sum(abs(sample[p] - reference[p]) for p in reference)
+        ),
+    ] + benchmark_graph(name, graph, args)
+
+
+def benchmark_graph(name, graph, args):
+    """
+    Time every PageRank solver and sampling with many walkers on
+    a LinkGraph, and compare the results with the power iteration.
+    """
+    info = {"corpus": name, "pages": graph.n, "links": len(graph.targets)}
+    records = []
+    reference = None
+    for solver, solve in SOLVERS.items():
+        (ranks, iterations, residual), seconds = timed(
+            solve, graph, DAMPING, args.tolerance
+        )
+        if reference is None:
+            reference = ranks
+        records.append(dict(
+            info, task=f"iterate:{solver}", seconds=seconds,
+            iterations=iterations, residual=float(residual),
+            error=float(np.abs(ranks - reference).sum())
+        ))
+
+    samples = max(args.samples, 10 * graph.n)
+    ranks, seconds = timed(
+        walk_pagerank, graph, DAMPING, samples, 1000, args.seed
+    )
+    records.append(dict(
+        info, task="walk_pagerank", seconds=seconds, samples=samples,
+        error=float(np.abs(ranks - reference).sum())
+    ))
+    return records
+
+
+def print_table(records):
+    print(f"{'corpus':<20}{'pages':>9}{'task':>22}{'seconds':>10}"
+          f"{'iterations':>11}{'residual':>10}{'L1 error':>10}")
+    for r in records:
+        iterations = r.get("iterations", "")
+        residual = f"{r['residual']:.1e}" if "residual" in r else ""
+        error = f"{r['error']:.1e}" if "error" in r else ""
+        print(f"{r['corpus']:<20}{r['pages']:>9}{r['task']:>22}"
+              f"{r['seconds']:>10.3f}{iterations:>11}{residual:>10}{error:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,63 @@
+import hashlib
+import numpy as np
 import os
+import pickle
+import posixpath
 import random
 import re
+import scipy.sparse
 import sys
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from html.parser import HTMLParser
+from urllib.parse import urldefrag, urljoin, urlsplit
+
 DAMPING = 0.85
 SAMPLES = 10000
 
+# Random surfers moving at once in walk_pagerank, and steps they take
+# before samples are counted: many short walks from a random page would
+# otherwise be biased towards their starting distribution, whose
+# influence shrinks by a factor of at least DAMPING at every step
+WALKERS = 1000
+BURN_IN = 100
+
+# Independent walks whose estimates are merged in parallel_pagerank
+SHARDS = 32
+
+# Largest L1 change between iterations at which PageRank has converged
+TOLERANCE = 1e-6
+
+# Most iterations personalized_pagerank makes, in case `tolerance` is
+# below what floating point can reach
+MAX_ITERATIONS = 10000
+
+# Number of blocks of pages updated in turn by gauss_seidel, and
+# iterations between two extrapolations in quadratic_extrapolation
+BLOCKS = 256
+EXTRAPOLATION_PERIOD = 10
+
+# Characters read at a time from each page by crawl_graph
+CHUNK_SIZE = 1 << 16
+
 def main():
-    if len(sys.argv) != 2:
-        sys.exit("Usage: python pagerank.py corpus")
-    corpus = crawl(sys.argv[1])
-    ranks = sample_pagerank(corpus, DAMPING, SAMPLES)
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python pagerank.py corpus [cache]")
+    cache = load_cache(sys.argv[2]) if len(sys.argv) == 3 else None
+    graph = crawl_graph(sys.argv[1], cache=cache)
+    ranks = dict(zip(graph.pages, walk_pagerank(graph, DAMPING, SAMPLES)))
     print(f"PageRank Results from Sampling (n = {SAMPLES})")
     for page in sorted(ranks):
         print(f"  {page}: {ranks[page]:.4f}")
-    ranks = iterate_pagerank(corpus, DAMPING)
+    if cache is None:
+        ranks = iterate_pagerank(graph, DAMPING)
+    else:
+        start = warm_start(graph, cache.get("ranks", dict()))
+        ranks, _, _ = power_iteration(graph, DAMPING, ranks=start)
+        ranks = dict(zip(graph.pages, ranks.tolist()))
+        cache["ranks"] = ranks
+        save_cache(sys.argv[2], cache)
     print(f"PageRank Results from Iteration")
     for page in sorted(ranks):
         print(f"  {page}: {ranks[page]:.4f}")
@@ -45,6 +88,197 @@ def crawl(directory):
 
     return pages
 
+def crawl_graph(directory, workers=None, cache=None):
+    """
+    Parse a directory of HTML pages on a pool of `workers` processes
+    and return a LinkGraph of the links between pages of the corpus.
+
+    Pages are read in chunks and tokenized incrementally, and links
+    are resolved relative to the page they appear on.
+
+    If `cache` is a dictionary (see `load_cache`), links are read from
+    it for pages that did not change since they were cached, and the
+    cache is updated with the others.
+    """
+    pages = sorted(
+        filename for filename in os.listdir(directory)
+        if filename.endswith(".html")
+    )
+    index = {page: i for i, page in enumerate(pages)}
+
+    if cache is not None:
+        links = update_cache(directory, pages, cache, workers)
+        targets = [
+            np.array(sorted(set(
+                index[link] for link in links[page]
+                if link in index and link != page
+            )), dtype=np.int64)
+            for page in pages
+        ]
+    else:
+        with ProcessPoolExecutor(
+            workers, initializer=share_corpus, initargs=(directory, index)
+        ) as pool:
+            targets = list(pool.map(
+                parse_links, pages, chunksize=max(len(pages) // 256, 1)
+            ))
+
+    sources = np.repeat(
+        np.arange(len(pages)), [len(links) for links in targets]
+    )
+    targets = np.concatenate([np.zeros(0, dtype=np.int64)] + targets)
+    return LinkGraph(pages, sources, targets)
+
+
+def load_cache(filename):
+    """
+    Return the crawl cache saved in `filename`, or an empty one.
+
+    The cache maps "pages" to a dictionary with the modification time,
+    size, content hash and local links of every page crawled, and
+    "ranks" to the last PageRank values computed for the corpus.
+    """
+    try:
+        with open(filename, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return {"pages": dict(), "ranks": dict()}
+
+
+def save_cache(filename, cache):
+    """
+    Save the crawl cache `cache` to `filename`.
+    """
+    with open(filename, "wb") as f:
+        pickle.dump(cache, f)
+
+
+def update_cache(directory, pages, cache, workers=None):
+    """
+    Bring the cached links of `pages` up to date, re-parsing only the
+    pages whose modification time or size changed, and whose contents
+    no longer match their cached hash.
+    Return a dictionary mapping each page to its cached links.
+    """
+    entries = cache.setdefault("pages", dict())
+    for page in set(entries) - set(pages):
+        del entries[page]
+
+    stale = []
+    for page in pages:
+        stat = os.stat(os.path.join(directory, page))
+        entry = entries.get(page)
+        if (
+            entry is None
+            or entry["mtime"] != stat.st_mtime_ns
+            or entry["size"] != stat.st_size
+        ):
+            stale.append((page, entry["hash"] if entry else None))
+            entries[page] = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "hash": None,
+                "links": entry["links"] if entry else (),
+            }
+
+    if stale:
+        with ProcessPoolExecutor(
+            workers, initializer=share_corpus, initargs=(directory, None)
+        ) as pool:
+            for (page, _), (digest, links) in zip(stale, pool.map(
+                scan_page, stale, chunksize=max(len(stale) // 256, 1)
+            )):
+                entries[page]["hash"] = digest
+                if links is not None:
+                    entries[page]["links"] = links
+
+    return {page: entries[page]["links"] for page in pages}
+
+
+class LinkParser(HTMLParser):
+    """
+    HTML tokenizer collecting the `href` of every `<a>` tag.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            for name, value in attrs:
+                if name == "href" and value:
+                    self.links.append(value)
+
+
+# Corpus directory and page numbers, in the processes of crawl_graph
+shared_corpus = None
+
+
+def share_corpus(directory, index):
+    global shared_corpus
+    shared_corpus = (directory, index)
+
+
+def parse_links(page):
+    """
+    Return the sorted array of numbers of the other pages
+    of the corpus linked to by `page`.
+    """
+    directory, index = shared_corpus
+    links = set()
+    for link in read_links(os.path.join(directory, page), page):
+        if link in index and link != page:
+            links.add(index[link])
+    return np.array(sorted(links), dtype=np.int64)
+
+
+def scan_page(task):
+    """
+    Given a `(page, digest)` pair, return the hash of the contents of
+    `page` and, unless it equals `digest`, the sorted tuple of local
+    pages it links to.
+    """
+    page, digest = task
+    filename = os.path.join(shared_corpus[0], page)
+    sha = hashlib.sha1()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha.update(chunk)
+    if sha.hexdigest() == digest:
+        return digest, None
+    return sha.hexdigest(), tuple(sorted(read_links(filename, page)))
+
+
+def read_links(filename, page):
+    """
+    Return the set of paths, relative to the corpus, of the local pages
+    linked to by `page`, read from `filename`.
+    """
+    parser = LinkParser()
+    with open(filename) as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), ""):
+            parser.feed(chunk)
+    parser.close()
+
+    base = posixpath.dirname(page)
+    links = set(resolve(base, href) for href in parser.links)
+    links.discard(None)
+    return links
+
+
+@lru_cache(maxsize=1 << 16)
+def resolve(base, href):
+    """
+    Return the path, relative to the corpus, of the page `href` points
+    to from a page in directory `base`, or None if it is another site.
+    """
+    url = urlsplit(urljoin(base + "/", urldefrag(href).url))
+    if url.scheme or url.netloc:
+        return None
+    return posixpath.normpath(url.path).lstrip("/")
+
+
 def transition_model(corpus, page, damping_factor):
     """
     Return a probability distribution over which page to visit next,
@@ -77,50 +311,411 @@ def sample_pagerank(corpus, damping_factor, n):
     their estimated PageRank value (a value between 0 and 1). All
     PageRank values should sum to 1.
     """
+    # Each step draws from the transition model directly: with
+    # probability `damping_factor` follow a random link, otherwise
+    # (or if there are no links) jump to a random page
+    pages = list(corpus.keys())
+    links = {page: sorted(corpus[page]) for page in pages}
     count = {k: 0 for k in corpus}
-    page = random.choice(list(corpus.keys()))
+    page = random.choice(pages)
 
     for _ in range(0, n):
         count[page] += 1
-        t_model = transition_model(corpus, page, damping_factor)
-        page = random.choices(list(t_model.keys()), list(t_model.values()))[0]
+        if links[page] and random.random() < damping_factor:
+            page = random.choice(links[page])
+        else:
+            page = random.choice(pages)
 
     result = {k: count[k]/n for k in count}
     # print(f"sum = {sum(result.values())}")
     return result
 
-def iterate_pagerank(corpus, damping_factor):
+
+def walk_pagerank(graph, damping_factor, n, walkers=WALKERS, rng=None,
+                  burn_in=BURN_IN):
+    """
+    Return the vector of PageRank values of the pages of `graph`,
+    estimated from `n` samples taken by `walkers` random surfers
+    moving all at once, each starting on a page at random and
+    taking `burn_in` steps before its samples are counted.
+
+    `rng` is a NumPy random Generator, or a seed for a new one.
+    """
+    rng = np.random.default_rng(rng)
+    counts = np.zeros(graph.n, dtype=np.int64)
+    pages = rng.integers(graph.n, size=walkers)
+    visited = []
+    remaining = n + burn_in * walkers
+
+    while remaining > 0:
+        if remaining <= n:
+            visited.append(pages[:remaining])
+
+            # Count visits in batches, as counting costs O(graph.n)
+            if remaining <= walkers or len(visited) * walkers >= graph.n:
+                counts += np.bincount(
+                    np.concatenate(visited), minlength=graph.n
+                )
+                visited = []
+        remaining -= walkers
+
+        degree = graph.out_degree[pages]
+        follow = (rng.random(walkers) < damping_factor) & (degree > 0)
+        choice = graph.out_start[pages] + (
+            rng.random(walkers) * degree
+        ).astype(np.int64)
+        pages = rng.integers(graph.n, size=walkers)
+        pages[follow] = graph.out_links[choice[follow]]
+
+    return counts / n
+
+
+def parallel_pagerank(graph, damping_factor, n, workers=None, seed=None,
+                      shards=SHARDS, walkers=WALKERS, burn_in=BURN_IN):
+    """
+    Return PageRank values of the pages of `graph` estimated from `n`
+    samples, split into `shards` independent walks run on a pool of
+    `workers` processes, each with its own random stream derived
+    from `seed`.
+
+    Return a tuple `(ranks, errors)` of vectors, where `errors` is the
+    standard error of each rank, estimated from the spread of the
+    estimates of the individual walks.
+    """
+    sizes = [n // shards + (1 if k < n % shards else 0) for k in range(shards)]
+    streams = np.random.SeedSequence(seed).spawn(shards)
+    tasks = [
+        (damping_factor, size, walkers, burn_in, stream)
+        for size, stream in zip(sizes, streams) if size
+    ]
+    with ProcessPoolExecutor(
+        workers, initializer=share_graph, initargs=(graph,)
+    ) as pool:
+        estimates = np.array(list(pool.map(walk_shard, tasks)))
+
+    weights = np.array([task[1] for task in tasks]) / n
+    ranks = weights @ estimates
+    if len(tasks) < 2:
+        return ranks, np.full(graph.n, np.nan)
+    errors = estimates.std(axis=0, ddof=1) / np.sqrt(len(tasks))
+    return ranks, errors
+
+
+# Graph walked by the processes of parallel_pagerank
+shared_graph = None
+
+
+def share_graph(graph):
+    global shared_graph
+    shared_graph = graph
+
+
+def walk_shard(task):
+    damping_factor, n, walkers, burn_in, stream = task
+    return walk_pagerank(
+        shared_graph, damping_factor, n, walkers,
+        np.random.default_rng(stream), burn_in
+    )
+
+
+def iterate_pagerank(corpus, damping_factor, solver="power"):
     """
     Return PageRank values for each page by iteratively updating
-    PageRank values until convergence.
+    PageRank values until convergence, using one of SOLVERS.
 
     Return a dictionary where keys are page names, and values are
     their estimated PageRank value (a value between 0 and 1). All
     PageRank values should sum to 1.
     """
-    result = {p: 1/len(corpus) for p in corpus}
-    can_stop = {p: False for p in corpus}
-    
-    while any(v is False for v in can_stop.values()):
-        for p in result:
-            second = 0
-            for page, link in corpus.items():
-                if page == p:
-                    continue
-                if not link:
-                    second += result[page]/len(corpus)
-                elif p in link:
-                    second += result[page]/len(link)               
-            new_pr = ((1-damping_factor)/len(corpus))+(damping_factor*second)
-            if new_pr - result[p] < 0.001:
-                can_stop[p] = True
-            result[p] = new_pr
-        
-        temp_sum = sum(result.values())
-        result = {p: (r / temp_sum) for p, r in result.items()}
-
-    # print(f"sum = {round(sum(result.values()),4)}")
-    return result
+    graph = as_graph(corpus)
+    ranks, _, _ = SOLVERS[solver](graph, damping_factor)
+    return dict(zip(graph.pages, ranks.tolist()))
+
+
+def personalized_pagerank(corpus, damping_factor, teleports,
+                          tolerance=TOLERANCE, max_iterations=MAX_ITERATIONS):
+    """
+    Return personalized PageRank values for many teleport distributions
+    at once: with probability `1 - damping_factor`, and from pages
+    without links, the surfer jumps to a page chosen according to the
+    teleport distribution instead of uniformly.
+
+    `teleports` is a matrix with one row per distribution and one column
+    per page of `as_graph(corpus).pages`, or a list of dictionaries
+    mapping pages to weights. Rows are normalized to sum to 1. Raise
+    ValueError if there are no rows, if a dictionary names a page not
+    in the corpus, or if a row has a negative or non-finite weight, or
+    no positive weight at all.
+
+    All distributions are iterated together, so that each iteration is
+    a single pass over the links, until they converge or after
+    `max_iterations` iterations. Return a matrix with one row of
+    PageRank values per teleport distribution.
+    """
+    graph = as_graph(corpus)
+    if len(teleports) == 0:
+        raise ValueError("no teleport distributions")
+    if isinstance(teleports, np.ndarray) or not isinstance(teleports[0], dict):
+        teleports = np.array(teleports, dtype=float)
+    else:
+        index = {page: i for i, page in enumerate(graph.pages)}
+        rows = teleports
+        unknown = sorted(
+            {page for weights in rows for page in weights} - index.keys()
+        )
+        if unknown:
+            raise ValueError(f"teleport pages {unknown} are not in the corpus")
+        teleports = np.zeros((len(rows), graph.n))
+        for row, weights in zip(teleports, rows):
+            for page, weight in weights.items():
+                row[index[page]] = weight
+    if not np.isfinite(teleports).all() or (teleports < 0).any():
+        raise ValueError("teleport weights must be finite and non-negative")
+    totals = teleports.sum(axis=1, keepdims=True)
+    if (totals <= 0).any():
+        empty = np.flatnonzero(totals <= 0).tolist()
+        raise ValueError(f"teleport distributions {empty} have no weight")
+    teleports = np.ascontiguousarray((teleports / totals).T)
+
+    # Updated in place, as every pass over the matrices costs as much
+    # as spreading them along the links
+    ranks = teleports.copy()
+    scratch = np.empty_like(ranks)
+    for _ in range(max_iterations):
+        jump = 1 - damping_factor + damping_factor * (
+            ranks[graph.dangling].sum(axis=0)
+        )
+        new_ranks = graph.spread(ranks)
+        new_ranks *= damping_factor
+        new_ranks += np.multiply(teleports, jump, out=scratch)
+        np.subtract(new_ranks, ranks, out=scratch)
+        change = np.abs(scratch, out=scratch).sum(axis=0).max()
+        ranks = new_ranks
+        if change < tolerance:
+            break
+    return ranks.T
+
+
+def as_graph(corpus):
+    """
+    Return `corpus` as a LinkGraph, building one if it is a dictionary
+    mapping each page to the set of pages it links to.
+    """
+    if isinstance(corpus, LinkGraph):
+        return corpus
+    return LinkGraph.from_corpus(corpus)
+
+
+# Every solver takes a LinkGraph, a damping factor, a tolerance and
+# optional starting ranks, and returns a tuple `(ranks, iterations,
+# residual)`, where `residual` is the L1 norm of the change one more
+# power iteration would make to `ranks`.
+
+def power_iteration(graph, damping_factor, tolerance=TOLERANCE, ranks=None):
+    """
+    Compute PageRank updating all pages at once, starting from `ranks`
+    (by default, the same value for every page), until the L1 norm of
+    their change falls below `tolerance`.
+    """
+    ranks = np.full(graph.n, 1 / graph.n) if ranks is None else ranks
+    iterations = 0
+    while True:
+        iterations += 1
+        new_ranks = step(graph, damping_factor, ranks)
+        change = np.abs(new_ranks - ranks).sum()
+        ranks = new_ranks
+        if change < tolerance:
+            return ranks, iterations, residual(graph, damping_factor, ranks)
+
+
+def gauss_seidel(graph, damping_factor, tolerance=TOLERANCE, ranks=None,
+                 blocks=BLOCKS):
+    """
+    Compute PageRank updating the pages in place, in `blocks` groups
+    of consecutive pages, so that each group already uses the values
+    computed for the groups before it in the same sweep.
+    """
+    n = graph.n
+    ranks = np.full(n, 1 / n) if ranks is None else ranks.copy()
+    size = -(-n // blocks)
+    dangling = ranks[graph.dangling].sum()
+    iterations = 0
+    while True:
+        iterations += 1
+        change = 0
+        for start in range(0, n, size):
+            stop = min(start + size, n)
+            links = slice(graph.in_start[start], graph.in_start[stop])
+            flow = np.bincount(
+                graph.targets[links] - start,
+                weights=(
+                    ranks[graph.sources[links]] * graph.link_weights[links]
+                ),
+                minlength=stop - start
+            )
+            new_ranks = (
+                (1 - damping_factor) / n
+                + damping_factor * (flow + dangling / n)
+            )
+            block_dangling = graph.dangling[start:stop]
+            dangling += (
+                new_ranks[block_dangling].sum()
+                - ranks[start:stop][block_dangling].sum()
+            )
+            change += np.abs(new_ranks - ranks[start:stop]).sum()
+            ranks[start:stop] = new_ranks
+        if change < tolerance:
+            ranks /= ranks.sum()
+            return ranks, iterations, residual(graph, damping_factor, ranks)
+
+
+def quadratic_extrapolation(graph, damping_factor, tolerance=TOLERANCE,
+                            ranks=None, period=EXTRAPOLATION_PERIOD):
+    """
+    Compute PageRank with power iteration, replacing the ranks every
+    `period` iterations by a quadratic extrapolation of the last four
+    iterates, which removes the slowest-decaying error components
+    (Kamvar et al., "Extrapolation Methods for Accelerating PageRank
+    Computations").
+    """
+    ranks = np.full(graph.n, 1 / graph.n) if ranks is None else ranks
+    history = [ranks]
+    iterations = 0
+    while True:
+        iterations += 1
+        new_ranks = step(graph, damping_factor, ranks)
+        change = np.abs(new_ranks - ranks).sum()
+        ranks = new_ranks
+        if change < tolerance:
+            return ranks, iterations, residual(graph, damping_factor, ranks)
+
+        history = history[-3:] + [ranks]
+        if iterations % period == 0 and len(history) == 4:
+            x0, x1, x2, x3 = history
+            y = np.stack((x1 - x0, x2 - x0), axis=1)
+            gamma, *_ = np.linalg.lstsq(y, -(x3 - x0), rcond=None)
+            beta = (gamma[0] + gamma[1] + 1, gamma[1] + 1, 1)
+            extrapolated = beta[0] * x1 + beta[1] * x2 + beta[2] * x3
+            extrapolated = np.maximum(extrapolated, 0)
+            if extrapolated.sum() > 0:
+                ranks = extrapolated / extrapolated.sum()
+                history = [ranks]
+
+
+SOLVERS = {
+    "power": power_iteration,
+    "gauss-seidel": gauss_seidel,
+    "quadratic": quadratic_extrapolation,
+}
+
+
+def step(graph, damping_factor, ranks):
+    """
+    Return the PageRank values after one power iteration from `ranks`.
+
+    Pages without links are treated as linking to every page, which
+    adds the same share of their rank to every page.
+    """
+    dangling = ranks[graph.dangling].sum() / graph.n
+    return (
+        (1 - damping_factor) / graph.n
+        + damping_factor * (graph.spread(ranks) + dangling)
+    )
+
+
+def residual(graph, damping_factor, ranks):
+    """
+    Return the L1 norm of the change one power iteration
+    would make to `ranks`.
+    """
+    return np.abs(step(graph, damping_factor, ranks) - ranks).sum()
+
+
+def warm_start(graph, ranks):
+    """
+    Return a vector of initial PageRank values for the pages of `graph`
+    from a dictionary of previous `ranks`, giving new pages the average
+    rank, so that iterating after small changes to the corpus only takes
+    a few iterations.
+    """
+    start = np.array([ranks.get(page, np.nan) for page in graph.pages])
+    known = ~np.isnan(start)
+    start[~known] = start[known].mean() if known.any() else 1
+    return start / start.sum()
+
+
+class LinkGraph():
+    """
+    Compact representation of a corpus: pages are numbered in sorted
+    order, and links are stored as arrays of (source, target) page
+    numbers sorted by target, i.e. a sparse transition matrix.
+    """
+
+    def __init__(self, pages, sources, targets):
+        self.pages = list(pages)
+        self.n = len(self.pages)
+
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        order = np.argsort(targets, kind="stable")
+        self.sources = sources[order]
+        self.targets = targets[order]
+
+        # Share of its rank a page gives to each of its links
+        self.out_degree = np.bincount(self.sources, minlength=self.n)
+        self.dangling = self.out_degree == 0
+        self.link_weights = 1 / self.out_degree[self.sources]
+
+        # Links into page i are those from in_start[i] to in_start[i + 1],
+        # which makes the transition matrix (without dangling pages)
+        # a CSR matrix with one row per target page
+        self.in_start = np.searchsorted(self.targets, np.arange(self.n + 1))
+        self.matrix = scipy.sparse.csr_matrix(
+            (self.link_weights, self.sources, self.in_start),
+            shape=(self.n, self.n)
+        )
+
+        # Targets of the links of each page, for walking the graph:
+        # the links of page i are out_links[out_start[i]:out_start[i + 1]]
+        self.out_links = self.targets[np.argsort(self.sources, kind="stable")]
+        self.out_start = np.concatenate(([0], np.cumsum(self.out_degree)))
+
+    @classmethod
+    def from_corpus(cls, corpus):
+        """
+        Build a LinkGraph from a dictionary mapping each page
+        to the set of pages it links to.
+        """
+        pages = sorted(corpus)
+        index = {page: i for i, page in enumerate(pages)}
+        sources = []
+        targets = []
+        for page, links in corpus.items():
+            for link in links:
+                sources.append(index[page])
+                targets.append(index[link])
+        return cls(pages, sources, targets)
+
+    def to_corpus(self):
+        """
+        Return the dictionary mapping each page
+        to the set of pages it links to.
+        """
+        corpus = {page: set() for page in self.pages}
+        for source, target in zip(self.sources.tolist(), self.targets.tolist()):
+            corpus[self.pages[source]].add(self.pages[target])
+        return corpus
+
+    def spread(self, ranks):
+        """
+        Return, for every page, the sum of the ranks flowing into it,
+        each page sharing its rank equally among its links.
+
+        `ranks` is either a vector, or a matrix with one row per page
+        and one column per rank vector.
+        """
+        return self.matrix @ ranks
+
 
 if __name__ == "__main__":
     main()
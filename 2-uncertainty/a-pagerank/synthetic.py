@@ -0,0 +1,131 @@
+import argparse
+import numpy as np
+import os
+
+from pagerank import LinkGraph
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic corpus with a power-law link graph."
+    )
+    parser.add_argument("pages", type=int)
+    parser.add_argument("output", help="directory of HTML pages, or edge list")
+    parser.add_argument(
+        "--format", choices=["html", "edges"], default="html"
+    )
+    parser.add_argument("--degree", type=float, default=8)
+    parser.add_argument("--exponent", type=float, default=2.1)
+    parser.add_argument("--dangling", type=float, default=0.1)
+    parser.add_argument("--components", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    graph = power_law_graph(
+        args.pages, args.degree, args.exponent,
+        args.dangling, args.components, args.seed
+    )
+    if args.format == "html":
+        write_corpus(graph, args.output)
+    else:
+        write_edge_list(graph, args.output)
+    print(f"{graph.n} pages, {len(graph.targets)} links")
+
+
+def power_law_graph(n, degree, exponent=2.1, dangling=0.0, components=1,
+                    rng=None):
+    """
+    Return a random LinkGraph of `n` pages with `degree` links per page
+    on average, whose in-degrees and out-degrees follow power laws with
+    the given `exponent`.
+
+    A `dangling` fraction of the pages has no links, and pages are
+    split into `components` groups of consecutive pages with no links
+    between groups.
+    """
+    rng = np.random.default_rng(rng)
+
+    # Heavy-tailed weights, normalized to the requested mean degree
+    out_weights = rng.pareto(exponent - 1, n) + 1
+    out_degree = rng.poisson(out_weights * degree / out_weights.mean())
+    out_degree[rng.random(n) < dangling] = 0
+    in_weights = rng.pareto(exponent - 1, n) + 1
+
+    sources = []
+    targets = []
+    bounds = np.linspace(0, n, components + 1).astype(np.int64)
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if start == stop:
+            continue
+        component_sources = np.repeat(
+            np.arange(start, stop), out_degree[start:stop]
+        )
+        weights = in_weights[start:stop]
+        sources.append(component_sources)
+        targets.append(start + rng.choice(
+            stop - start, size=len(component_sources), p=weights / weights.sum()
+        ))
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+
+    # Drop self-links and duplicate links, as crawling does
+    keep = sources != targets
+    links = np.unique(sources[keep] * n + targets[keep])
+    pages = [f"{i}.html" for i in range(n)]
+    return LinkGraph(pages, links // n, links % n)
+
+
+def write_corpus(graph, directory):
+    """
+    Write every page of `graph` as an HTML file in `directory`,
+    with one `<a>` tag per link.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for page in range(graph.n):
+        start, stop = graph.out_start[page], graph.out_start[page + 1]
+        links = "\n".join(
+            f'            <li><a href="{graph.pages[link]}">{graph.pages[link]}</a></li>'
+            for link in graph.out_links[start:stop].tolist()
+        )
+        with open(os.path.join(directory, graph.pages[page]), "w") as f:
+            f.write(
+                "<!DOCTYPE html>\n<html lang=\"en\">\n"
+                f"    <head>\n        <title>{graph.pages[page]}</title>\n    </head>\n"
+                "    <body>\n        <ul>\n"
+                f"{links}\n"
+                "        </ul>\n    </body>\n</html>\n"
+            )
+
+
+def write_edge_list(graph, filename):
+    """
+    Write `graph` to `filename`, one line per page with no links,
+    and one "source target" line per link.
+    """
+    with open(filename, "w") as f:
+        for page in np.flatnonzero(graph.dangling).tolist():
+            f.write(f"{graph.pages[page]}\n")
+        for source, target in zip(graph.sources.tolist(), graph.targets.tolist()):
+            f.write(f"{graph.pages[source]} {graph.pages[target]}\n")
+
+
+def read_edge_list(filename):
+    """
+    Return the LinkGraph of an edge list written by `write_edge_list`.
+    """
+    index = dict()
+    sources = []
+    targets = []
+    with open(filename) as f:
+        for line in f:
+            names = line.split()
+            for name in names:
+                index.setdefault(name, len(index))
+            if len(names) == 2:
+                sources.append(index[names[0]])
+                targets.append(index[names[1]])
+    return LinkGraph(list(index), sources, targets)
+
+
+if __name__ == "__main__":
+    main()
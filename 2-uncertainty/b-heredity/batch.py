@@ -0,0 +1,110 @@
+import argparse
+import csv
+import glob
+import json
+import os
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from heredity import JunctionTree, load_data
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compute gene and trait probabilities for many families."
+    )
+    parser.add_argument(
+        "paths", nargs="+",
+        help="CSV files, directories of CSV files, or glob patterns"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    # Group families by the shape of their pedigree
+    groups = dict()
+    for filename in find_files(args.paths):
+        try:
+            people = load_data(filename)
+            key = topology(people)
+        except (OSError, KeyError, ValueError, csv.Error) as e:
+            print(json.dumps({"file": filename, "error": repr(e)}), flush=True)
+            continue
+        traits = tuple(person["trait"] for person in people.values())
+        groups.setdefault(key, []).append((filename, list(people), traits))
+
+    # Solve each shape once, largest pedigrees first
+    with ProcessPoolExecutor(args.workers) as pool:
+        futures = {
+            pool.submit(solve, key, families): families
+            for key, families in sorted(
+                groups.items(), key=lambda group: len(group[0]), reverse=True
+            )
+        }
+        for future in as_completed(futures):
+            try:
+                records = future.result()
+            except Exception as e:
+                records = [
+                    {"file": filename, "error": repr(e)}
+                    for filename, _, _ in futures[future]
+                ]
+            for record in records:
+                print(json.dumps(record), flush=True)
+
+
+def find_files(paths):
+    """
+    Return the CSV files named by `paths`, which may be files,
+    directories of CSV files, or glob patterns.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.csv"))))
+        else:
+            files.extend(sorted(glob.glob(path)) or [path])
+    return files
+
+
+def topology(people):
+    """
+    Return the shape of the pedigree in `people`: for each person in
+    order, the positions of their mother and father, or None.
+    """
+    index = {name: i for i, name in enumerate(people)}
+    return tuple(
+        (
+            index[person["mother"]] if person["mother"] else None,
+            index[person["father"]] if person["father"] else None,
+        )
+        for person in people.values()
+    )
+
+
+def solve(key, families):
+    """
+    Compile the pedigree shape `key` once, and return a record of gene
+    and trait probabilities for each of `families`, a list of tuples
+    `(filename, names, traits)` in the order of the shape.
+    """
+    people = {
+        i: {"name": i, "mother": mother, "father": father, "trait": None}
+        for i, (mother, father) in enumerate(key)
+    }
+    tree = JunctionTree(people)
+
+    results = dict()
+    records = []
+    for filename, names, traits in families:
+        if traits not in results:
+            results[traits] = tree.probabilities(dict(enumerate(traits)))
+        probabilities = results[traits]
+        records.append({
+            "file": filename,
+            "people": {name: probabilities[i] for i, name in enumerate(names)},
+        })
+    return records
+
+
+if __name__ == "__main__":
+    main()
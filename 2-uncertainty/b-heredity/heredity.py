@@ -1,5 +1,8 @@
 import csv
+import functools
+import heapq
 import itertools
+import math
 import sys
 
 PROBS = {
@@ -17,42 +20,42 @@ PROBS = {
     "mutation": 0.01,
 }
 
+# Possible numbers of copies of the gene
+GENES = (0, 1, 2)
 
-def main():
-    # Check for proper usage
-    if len(sys.argv) != 2:
-        sys.exit("Usage: python heredity.py data.csv")
-    people = load_data(sys.argv[1])
+# Number of gene assignments evaluated at once by the vectorized engine
+CHUNK_SIZE = 1 << 18
 
-    # Keep track of gene and trait probabilities for each person
-    probabilities = {
-        person: {"gene": {2: 0, 1: 0, 0: 0}, "trait": {True: 0, False: 0}}
-        for person in people
-    }
+# Default number of gene assignments drawn by the sampling engines
+SAMPLES = 100000
 
-    # Loop over all sets of people who might have the trait
-    names = set(people)
-    for have_trait in powerset(names):
-        # Check if current set of people violates known information
-        fails_evidence = any(
-            (
-                people[person]["trait"] is not None
-                and people[person]["trait"] != (person in have_trait)
-            )
-            for person in names
-        )
-        if fails_evidence:
-            continue
+# Number of Gibbs sampling chains run side by side
+CHAINS = 100
+
+# Number of sweeps of each Gibbs chain discarded before sampling
+BURN_IN = 1000
 
-        # Loop over all sets of people who might have the gene
-        for one_gene in powerset(names):
-            for two_genes in powerset(names - one_gene):
-                # Update probabilities with new joint probability
-                p = joint_probability(people, one_gene, two_genes, have_trait)
-                update(probabilities, one_gene, two_genes, have_trait, p)
 
-    # Ensure probabilities sum to 1
-    normalize(probabilities)
+def main():
+    # Check for proper usage
+    if len(sys.argv) not in [2, 3, 4]:
+        sys.exit("Usage: python heredity.py data.csv [engine] [samples]")
+    engine = sys.argv[2] if len(sys.argv) > 2 else "elimination"
+    if engine not in ENGINES and engine not in SAMPLERS:
+        choices = ", ".join([*ENGINES, *SAMPLERS])
+        sys.exit(f"Unknown engine {engine}, choose from {choices}")
+    if len(sys.argv) == 4 and engine not in SAMPLERS:
+        sys.exit(f"Engine {engine} does not take a number of samples")
+    people = load_data(sys.argv[1])
+
+    # Compute gene and trait probabilities for each person, with their
+    # standard errors if they are estimated by sampling
+    errors = None
+    if engine in SAMPLERS:
+        samples = int(sys.argv[3]) if len(sys.argv) == 4 else SAMPLES
+        probabilities, errors = SAMPLERS[engine](people, samples)
+    else:
+        probabilities = ENGINES[engine](people)
 
     # Print results
     for person in people:
@@ -61,10 +64,126 @@ def main():
             print(f"  {field.capitalize()}:")
             for value in probabilities[person][field]:
                 p = probabilities[person][field][value]
-                print(f"    {value}: {p:.4f}")
+                if errors is None:
+                    print(f"    {value}: {p:.4f}")
+                else:
+                    error = errors[person][field][value]
+                    print(f"    {value}: {p:.4f} ± {error:.4f}")
             # print(f"  {sum(probabilities[person][field].values()):.1f}")
 
 
+def enumeration(people):
+    """
+    Return gene and trait probabilities for each person by summing
+    the joint probability of every assignment of genes.
+
+    Assignments come lazily from `assignments`, and their probabilities
+    are summed in log space so that large families do not underflow.
+    Traits that are not known are summed analytically by `distribution`.
+    """
+    names = ancestral_order(people)
+    index = {name: i for i, name in enumerate(names)}
+    factors = sorted(network(people), key=lambda f: index[f.variables[0]])
+    tables = [
+        (
+            [index[parent] for parent in factor.variables[1:]],
+            [math.log(p) if p > 0 else -math.inf for p in factor.values],
+        )
+        for factor in factors
+    ]
+
+    # Log of the summed probabilities of each gene count of each person
+    totals = [[-math.inf] * len(GENES) for _ in names]
+    for one_gene, two_genes, log_p in assignments(tables):
+        for i, total in enumerate(totals):
+            g = (one_gene >> i & 1) + 2 * (two_genes >> i & 1)
+            total[g] = log_add(total[g], log_p)
+
+    probabilities = dict()
+    for name, total in zip(names, totals):
+        log_sum = functools.reduce(log_add, total)
+        gene = [math.exp(p - log_sum) for p in total]
+        probabilities[name] = distribution(gene, people[name]["trait"])
+    return {person: probabilities[person] for person in people}
+
+
+def ancestral_order(people):
+    """
+    Return the names of `people` ordered so that parents come before
+    their children.
+    """
+    order = []
+    placed = set()
+
+    def place(name):
+        stack = [name]
+        while stack:
+            name = stack[-1]
+            parents = [
+                p for p in [people[name]["mother"], people[name]["father"]]
+                if p is not None and p not in placed
+            ]
+            if parents:
+                stack.extend(parents)
+                continue
+            stack.pop()
+            if name not in placed:
+                placed.add(name)
+                order.append(name)
+
+    for name in people:
+        place(name)
+    return order
+
+
+def assignments(tables):
+    """
+    Lazily yield a tuple `(one_gene, two_genes, log_p)` for every
+    assignment of genes with a nonzero probability.
+
+    `tables` lists, for each person in ancestral order, the positions of
+    their parents and the log-probabilities of the factor of `network`
+    over them and their parents. Person `i` has one or two copies of the
+    gene if bit `i` of `one_gene` or `two_genes` is set. Assignments are
+    extended one person at a time, and abandoned as soon as a person's
+    gene is impossible given their parents' genes.
+    """
+    stack = [(0, 0, 0, 0.0)]
+    while stack:
+        i, one_gene, two_genes, log_p = stack.pop()
+        if i == len(tables):
+            yield one_gene, two_genes, log_p
+            continue
+
+        parents, table = tables[i]
+        offset = 0
+        for j in parents:
+            offset = offset * len(GENES) + (
+                (one_gene >> j & 1) + 2 * (two_genes >> j & 1)
+            )
+        for g in GENES:
+            q = table[g * len(GENES) ** len(parents) + offset]
+            if q == -math.inf:
+                continue
+            stack.append((
+                i + 1,
+                one_gene | (g == 1) << i,
+                two_genes | (g == 2) << i,
+                log_p + q,
+            ))
+
+
+def log_add(a, b):
+    """
+    Return log(exp(a) + exp(b)) without leaving log space.
+    """
+    if a < b:
+        a, b = b, a
+    if b == -math.inf:
+        return a
+    return a + math.log1p(math.exp(b - a))
+
+
 def load_data(filename):
     """
     Load gene and trait data from a file into a dictionary.
@@ -195,5 +314,626 @@ def normalize(probabilities):
         #     trait[key] = value / trait_sum
 
 
+def variable_elimination(people):
+    """
+    Return gene and trait probabilities for each person by variable
+    elimination on the Bayesian network of the family, calibrating
+    its JunctionTree with the traits that are known.
+    """
+    return JunctionTree(people).probabilities(traits(people))
+
+
+def traits(people):
+    """
+    Return a dictionary from each person to their known trait, or None.
+    """
+    return {name: person["trait"] for name, person in people.items()}
+
+
+def vectorized(people):
+    """
+    Return gene and trait probabilities for each person by evaluating
+    the joint probability of every assignment of genes with NumPy.
+
+    Assignments are numbered in base 3, so the gene count of each person
+    is a column computed from the assignment numbers, and the factors
+    of `network` are looked up for all assignments at once. Known traits
+    are already part of these factors and unknown traits sum to 1, so
+    traits are never enumerated.
+    """
+    import numpy as np
+
+    names = list(people)
+    n = len(names)
+    column = {name: i for i, name in enumerate(names)}
+    factors = [
+        ([column[v] for v in factor.variables], np.array(factor.values))
+        for factor in network(people)
+    ]
+
+    totals = np.zeros((n, len(GENES)))
+    for start in range(0, len(GENES) ** n, CHUNK_SIZE):
+        codes = np.arange(start, min(start + CHUNK_SIZE, len(GENES) ** n))
+        genes = [
+            codes // len(GENES) ** (n - 1 - i) % len(GENES) for i in range(n)
+        ]
+        joint = np.ones(len(codes))
+        for columns, values in factors:
+            index = 0
+            for i in columns:
+                index = index * len(GENES) + genes[i]
+            joint *= values[index]
+        for i in range(n):
+            totals[i] += np.bincount(
+                genes[i], weights=joint, minlength=len(GENES)
+            )
+
+    totals /= totals.sum(axis=1, keepdims=True)
+    return {
+        name: distribution(totals[i], people[name]["trait"])
+        for i, name in enumerate(names)
+    }
+
+
+def likelihood_weighting(people, samples=SAMPLES, rng=None):
+    """
+    Return gene and trait probabilities for each person, and their
+    standard errors, estimated by likelihood weighting.
+
+    Genes are drawn for `samples` assignments from the network without
+    traits, in chunks of about `CHUNK_SIZE` genes but at least 1024
+    assignments, and each assignment is weighted by the probability of
+    the traits that are known. With
+    many known traits, a few assignments carry most of the weight, and
+    Gibbs sampling is more accurate.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(rng)
+    names = ancestral_order(people)
+    trait = np.array([PROBS["trait"][g][True] for g in GENES])
+    chunk = max(CHUNK_SIZE // len(names), 1 << 10)
+    tables = sampling_tables(people, names)
+
+    # Sums of weights, and of weights squared, of assignments and of
+    # their gene counts and trait probabilities, all scaled by the
+    # largest weight so far
+    log_scale = -np.inf
+    weights = squares = 0
+    gene_weights = np.zeros((len(names), len(GENES)))
+    gene_squares = np.zeros((len(names), len(GENES)))
+    trait_weights = np.zeros(len(names))
+    trait_squares = np.zeros(len(names))
+    trait_moments = np.zeros(len(names))
+    for start in range(0, samples, chunk):
+        genes, log_weights = forward_sample(
+            tables, min(chunk, samples - start), rng
+        )
+        if log_weights.max() > log_scale:
+            rescale = np.exp(log_scale - log_weights.max())
+            log_scale = log_weights.max()
+            weights *= rescale
+            gene_weights *= rescale
+            trait_weights *= rescale
+            squares *= rescale ** 2
+            gene_squares *= rescale ** 2
+            trait_squares *= rescale ** 2
+            trait_moments *= rescale ** 2
+        w = np.exp(log_weights - log_scale)
+
+        values = genes[:, :, None] == np.arange(len(GENES))
+        weights += w.sum()
+        squares += (w ** 2).sum()
+        gene_weights += np.einsum("isg,s->ig", values, w)
+        gene_squares += np.einsum("isg,s->ig", values, w ** 2)
+        values = trait[genes]
+        trait_weights += values @ w
+        trait_squares += values @ w ** 2
+        trait_moments += values ** 2 @ w ** 2
+
+    # Weighted means, with the standard errors of self-normalized
+    # weighting, sqrt(sum(w^2 (x - mean)^2)) / sum(w)
+    gene_means = gene_weights / weights
+    gene_errors = np.sqrt(np.maximum(
+        gene_squares * (1 - 2 * gene_means) + gene_means ** 2 * squares, 0
+    )) / weights
+    trait_means = trait_weights / weights
+    trait_errors = np.sqrt(np.maximum(
+        trait_moments - 2 * trait_means * trait_squares
+        + trait_means ** 2 * squares, 0
+    )) / weights
+    return estimates(
+        people, names, gene_means, gene_errors, trait_means, trait_errors
+    )
+
+
+def gibbs_sampling(people, samples=SAMPLES, rng=None):
+    """
+    Return gene and trait probabilities for each person, and their
+    standard errors, estimated by Gibbs sampling.
+
+    `CHAINS` chains start from forward samples of the network and are
+    updated side by side from the distribution of each person's gene
+    given everyone else's genes and the known traits. People who share
+    no factor are updated together, one group of `gibbs_groups` at a
+    time. After `BURN_IN` sweeps, these distributions are averaged
+    until `samples` genes have been drawn for each person. Standard
+    errors come from the spread of the averages of the chains, and are
+    infinite if `samples` is too small for more than one chain.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(rng)
+    names = ancestral_order(people)
+    chains = min(CHAINS, samples)
+    sweeps = max(samples // chains, 1)
+    genes, _ = forward_sample(sampling_tables(people, names), chains, rng)
+    # Extra row of genes that are always 0, for factors with fewer parents
+    genes = np.vstack([genes, np.zeros((1, chains), dtype=np.intp)])
+
+    candidates = np.arange(len(GENES))[:, None, None]
+    groups = gibbs_groups(people, names)
+    totals = np.zeros((len(names), len(GENES), chains))
+    for sweep in range(BURN_IN + sweeps):
+        for (group, values, starts, bases, strides,
+             others, other_strides) in groups:
+            # Product of the factors of every person in the group,
+            # for each possible gene of that person
+            offsets = (
+                bases[:, None]
+                + genes[others[:, 0]] * other_strides[:, 0, None]
+                + genes[others[:, 1]] * other_strides[:, 1, None]
+            )
+            scores = np.multiply.reduceat(
+                values[offsets + candidates * strides[:, None]], starts, axis=1
+            )
+            scores /= scores.sum(axis=0)
+
+            draws = rng.random((len(group), chains))
+            cumulative = np.cumsum(scores[:2], axis=0)
+            genes[group] = np.sum(draws >= cumulative, axis=0)
+            if sweep >= BURN_IN:
+                totals[group] += scores.transpose(1, 0, 2)
+
+    # Average of each chain, and the spread of these averages
+    trait = np.array([PROBS["trait"][g][True] for g in GENES])
+    gene_chains = totals / sweeps
+    trait_chains = np.einsum("g,igc->ic", trait, gene_chains)
+    if chains > 1:
+        spread = np.sqrt(chains)
+        gene_errors = gene_chains.std(axis=2, ddof=1) / spread
+        trait_errors = trait_chains.std(axis=1, ddof=1) / spread
+    else:
+        gene_errors = np.full(gene_chains.shape[:2], np.inf)
+        trait_errors = np.full(trait_chains.shape[:1], np.inf)
+    return estimates(
+        people, names,
+        gene_chains.mean(axis=2), gene_errors,
+        trait_chains.mean(axis=1), trait_errors
+    )
+
+
+def gibbs_groups(people, names):
+    """
+    Return groups of people who share no factor of the network, with
+    the arrays that look up the values of their factors.
+
+    Each group is a tuple `(group, values, starts, bases, strides,
+    others, other_strides)`. `group` lists the positions in `names` of
+    its people, and their factors follow one another, starting at
+    `starts`. Factor `e` has value `values[bases[e] + o + g * strides[e]]`
+    when its person has `g` copies of the gene, where
+    `o` sums the genes of the rows `others[e]` times `other_strides[e]`.
+    """
+    import numpy as np
+
+    index = {name: i for i, name in enumerate(names)}
+    factors = [[] for _ in names]
+    neighbors = [set() for _ in names]
+    values = []
+    base = 0
+    for factor in network(people):
+        variables = [index[v] for v in factor.variables]
+        strides = [
+            len(GENES) ** (len(variables) - 1 - k)
+            for k in range(len(variables))
+        ]
+        for k, i in enumerate(variables):
+            # Pad the other people to two with the row of zero genes
+            others = [
+                (j, stride) for j, stride in zip(variables, strides) if j != i
+            ]
+            others += [(len(names), 0)] * (2 - len(others))
+            factors[i].append((base, strides[k], others))
+            neighbors[i].update(variables)
+        values.extend(factor.values)
+        base += len(factor.values)
+    values = np.array(values)
+
+    # Greedily color people so that neighbors differ
+    colors = dict()
+    for i in range(len(names)):
+        taken = {colors[j] for j in neighbors[i] if j in colors}
+        colors[i] = next(c for c in itertools.count() if c not in taken)
+
+    groups = []
+    for color in range(max(colors.values()) + 1):
+        group = [i for i in range(len(names)) if colors[i] == color]
+        entries = [entry for i in group for entry in factors[i]]
+        starts = np.cumsum([0] + [len(factors[i]) for i in group[:-1]])
+        groups.append((
+            np.array(group),
+            values,
+            starts,
+            np.array([base for base, _, _ in entries]),
+            np.array([stride for _, stride, _ in entries]),
+            np.array([[j for j, _ in others] for _, _, others in entries]),
+            np.array([[s for _, s in others] for _, _, others in entries]),
+        ))
+    return groups
+
+
+def sampling_tables(people, names):
+    """
+    Return, for each of `names` in ancestral order, the positions of
+    their parents, the cumulative probabilities of their gene given
+    their parents' genes, and the log-probabilities of their known
+    trait given their gene, or None if it is not known.
+    """
+    import numpy as np
+
+    index = {name: i for i, name in enumerate(names)}
+    factors = {f.variables[0]: f for f in network(people, evidence=False)}
+    tables = []
+    for name in names:
+        factor = factors[name]
+        table = np.array(factor.values).reshape(len(GENES), -1)
+        trait = people[name]["trait"]
+        tables.append((
+            [index[parent] for parent in factor.variables[1:]],
+            np.cumsum(table, axis=0)[:-1],
+            None if trait is None else np.log(
+                [PROBS["trait"][g][trait] for g in GENES]
+            ),
+        ))
+    return tables
+
+
+def forward_sample(tables, samples, rng):
+    """
+    Return the genes of `samples` assignments drawn from the network
+    without traits, as an array with a row for each person of `tables`
+    from `sampling_tables`, and the log-probability of the known traits
+    given each assignment.
+    """
+    import numpy as np
+
+    genes = np.empty((len(tables), samples), dtype=np.intp)
+    log_weights = np.zeros(samples)
+    for i, (parents, cumulative, log_traits) in enumerate(tables):
+        offset = 0
+        for j in parents:
+            offset = offset * len(GENES) + genes[j]
+        thresholds = cumulative[:, offset].reshape(len(GENES) - 1, -1)
+        genes[i] = np.sum(rng.random(samples) >= thresholds, axis=0)
+        if log_traits is not None:
+            log_weights += log_traits[genes[i]]
+    return genes, log_weights
+
+
+def estimates(people, names, gene_means, gene_errors, trait_means,
+              trait_errors):
+    """
+    Return gene and trait probabilities and their standard errors, in
+    the format printed by `main`, from arrays of estimates for `names`.
+    """
+    probabilities = dict()
+    errors = dict()
+    for i, name in enumerate(names):
+        trait = people[name]["trait"]
+        probabilities[name] = distribution(gene_means[i].tolist(), trait)
+        if trait is None:
+            probabilities[name]["trait"] = {
+                True: float(trait_means[i]), False: float(1 - trait_means[i])
+            }
+        error = 0.0 if trait is not None else float(trait_errors[i])
+        errors[name] = {
+            "gene": {g: float(gene_errors[i][g]) for g in reversed(GENES)},
+            "trait": {True: error, False: error},
+        }
+    return (
+        {person: probabilities[person] for person in people},
+        {person: errors[person] for person in people},
+    )
+
+
+def distribution(gene, trait):
+    """
+    Return the gene and trait probabilities of a person, given the
+    probabilities `gene[g]` that they have `g` copies of the gene
+    and their `trait` if it is known.
+    """
+    if trait is None:
+        trait = sum(gene[g] * PROBS["trait"][g][True] for g in GENES)
+    else:
+        trait = float(trait)
+    return {
+        "gene": {g: gene[g] for g in reversed(GENES)},
+        "trait": {True: trait, False: 1 - trait},
+    }
+
+
+def network(people, evidence=True):
+    """
+    Return the factors of the Bayesian network of the family in `people`.
+
+    Each person has one factor over their gene and their parents' genes,
+    multiplied by the probability of their trait if it is known and
+    `evidence` is true. Traits that are not known sum to 1 and need
+    no factor.
+    """
+    mutation = PROBS["mutation"]
+    passes = {0: mutation, 1: 0.5, 2: 1 - mutation}
+    factors = []
+    for person in people.values():
+        parents = tuple(
+            p for p in [person["mother"], person["father"]] if p is not None
+        )
+        values = []
+        for genes in itertools.product(GENES, repeat=len(parents) + 1):
+            gene = genes[0]
+            if parents:
+                # A missing parent passes the gene only by mutation
+                m, f = ([passes[g] for g in genes[1:]] + [mutation])[:2]
+                p = (
+                    m * f if gene == 2
+                    else m * (1 - f) + f * (1 - m) if gene == 1
+                    else (1 - m) * (1 - f)
+                )
+            else:
+                p = PROBS["gene"][gene]
+            if evidence and person["trait"] is not None:
+                p *= PROBS["trait"][gene][person["trait"]]
+            values.append(p)
+        factors.append(Factor((person["name"],) + parents, values))
+    return factors
+
+
+def elimination_order(variables, scopes):
+    """
+    Return an order in which to eliminate `variables`, given the `scopes`
+    of the factors that mention them.
+
+    Each step eliminates the variable that adds the fewest edges between
+    its neighbors in the interaction graph, breaking ties by fewest
+    neighbors and then by the order of `variables`.
+    """
+    neighbors = {v: set() for v in variables}
+    for scope in scopes:
+        for v in scope:
+            neighbors[v].update(scope)
+            neighbors[v].discard(v)
+
+    def cost(v):
+        adjacent = list(neighbors[v])
+        fill = sum(
+            1
+            for i, a in enumerate(adjacent)
+            for b in adjacent[i + 1:]
+            if b not in neighbors[a]
+        )
+        return (fill, len(adjacent))
+
+    index = {v: i for i, v in enumerate(variables)}
+    costs = {v: cost(v) for v in variables}
+    heap = [(c, index[v], v) for v, c in costs.items()]
+    heapq.heapify(heap)
+
+    order = []
+    while heap:
+        c, _, v = heapq.heappop(heap)
+        if costs.get(v) != c:
+            continue
+        order.append(v)
+        del costs[v]
+
+        # Connect the neighbors of v, and update the costs they affect
+        adjacent = neighbors.pop(v)
+        affected = set(adjacent)
+        for a in adjacent:
+            neighbors[a].discard(v)
+            neighbors[a].update(adjacent - {a})
+            affected.update(neighbors[a])
+        for a in affected:
+            c = cost(a)
+            if costs[a] != c:
+                costs[a] = c
+                heapq.heappush(heap, (c, index[a], a))
+
+    return order
+
+
+class JunctionTree():
+    """
+    Tree of clusters of people whose genes are eliminated together,
+    compiled once for the structure of a family and calibrated for
+    any traits that are known.
+    """
+
+    def __init__(self, people):
+        """
+        Compile the family in `people`, ignoring their traits.
+
+        Eliminating each person in the order of `elimination_order`
+        forms a cluster of them and every person they share a factor or
+        a message with. The cluster sends the rest of its people, its
+        separator, to the cluster of the first of them to be eliminated.
+        """
+        factors = network(people, evidence=False)
+        scopes = [f.variables for f in factors]
+        self.order = elimination_order(list(people), scopes)
+        position = {person: i for i, person in enumerate(self.order)}
+
+        # Place every factor in the cluster of its first eliminated variable
+        buckets = [[] for _ in self.order]
+        for factor in factors:
+            buckets[min(position[v] for v in factor.variables)].append(factor)
+
+        self.clusters = []
+        self.children = [[] for _ in self.order]
+        self.potentials = []
+        self.gene_index = []
+        self.separator_index = []
+        self.parent_index = [None] * len(self.order)
+        for i, person in enumerate(self.order):
+            variables = [person] + [v for f in buckets[i] for v in f.variables]
+            for child in self.children[i]:
+                variables.extend(self.clusters[child][1:])
+            cluster = tuple(dict.fromkeys(variables))
+            self.clusters.append(cluster)
+
+            # Product of the factors of the cluster, over all its variables
+            uniform = Factor(cluster, [1] * len(GENES) ** len(cluster))
+            self.potentials.append(multiply([uniform] + buckets[i]).values)
+
+            # Positions of each assignment of the cluster in the
+            # distributions of its person and of its separator
+            separator = cluster[1:]
+            self.gene_index.append(index_map(cluster, (person,)))
+            self.separator_index.append(index_map(cluster, separator))
+            for child in self.children[i]:
+                self.parent_index[child] = index_map(
+                    cluster, self.clusters[child][1:]
+                )
+            if separator:
+                self.children[min(position[v] for v in separator)].append(i)
+
+    def calibrate(self, traits):
+        """
+        Return a dictionary from each person to the probabilities of
+        their numbers of copies of the gene, given `traits`, a dictionary
+        from people to their trait if it is known.
+
+        Messages pass up the tree and then back down, where each cluster
+        divides the distribution of a separator by the message it
+        received through it, so no product is taken twice.
+        """
+        beliefs = []
+        up = [None] * len(self.order)
+        for i, person in enumerate(self.order):
+            belief = self.potentials[i]
+            if traits.get(person) is not None:
+                likelihood = [PROBS["trait"][g][traits[person]] for g in GENES]
+                belief = [
+                    p * likelihood[g]
+                    for p, g in zip(belief, self.gene_index[i])
+                ]
+            for child in self.children[i]:
+                message = up[child]
+                belief = [
+                    p * message[j]
+                    for p, j in zip(belief, self.parent_index[child])
+                ]
+            size = len(GENES) ** (len(self.clusters[i]) - 1)
+            up[i] = accumulate(belief, self.separator_index[i], size)
+            beliefs.append(belief)
+
+        genes = dict()
+        for i in reversed(range(len(self.order))):
+            belief = beliefs[i]
+            for child in self.children[i]:
+                separator = accumulate(
+                    belief, self.parent_index[child], len(up[child])
+                )
+                message = [
+                    p / q if q else 0 for p, q in zip(separator, up[child])
+                ]
+                indices = self.separator_index[child]
+                beliefs[child] = [
+                    p * message[j] for p, j in zip(beliefs[child], indices)
+                ]
+            genes[self.order[i]] = accumulate(
+                belief, self.gene_index[i], len(GENES)
+            )
+        return genes
+
+    def probabilities(self, traits):
+        """
+        Return gene and trait probabilities for each person, in the
+        format printed by `main`, given their known `traits`.
+        """
+        genes = self.calibrate(traits)
+        return {
+            person: distribution(genes[person], trait)
+            for person, trait in traits.items()
+        }
+
+
+class Factor():
+    """
+    Non-negative function of the number of copies of the gene that
+    some people have. `values` lists its value for every assignment
+    of `GENES` to `variables`, in the order of `itertools.product`.
+    """
+
+    def __init__(self, variables, values):
+        self.variables = tuple(variables)
+        self.values = values
+
+
+def multiply(factors):
+    """
+    Return the product of `factors`, over the union of their variables.
+    """
+    variables = tuple(dict.fromkeys(v for f in factors for v in f.variables))
+    values = [1] * len(GENES) ** len(variables)
+    for factor in factors:
+        indices = index_map(variables, factor.variables)
+        values = [p * factor.values[i] for p, i in zip(values, indices)]
+    return Factor(variables, values)
+
+
+def accumulate(values, indices, size):
+    """
+    Return a list of `size` sums, adding each of `values` to the sum at
+    the matching position of `indices`, scaled to sum to 1.
+    """
+    sums = [0] * size
+    for i, p in zip(indices, values):
+        sums[i] += p
+    total = sum(sums)
+    if total > 0:
+        sums = [p / total for p in sums]
+    return sums
+
+
+def index_map(variables, scope):
+    """
+    Return, for every assignment of `variables` in the order of
+    `itertools.product`, the position in that order of its restriction
+    to the variables in `scope`.
+    """
+    strides = {
+        v: len(GENES) ** (len(scope) - 1 - i) for i, v in enumerate(scope)
+    }
+    indices = [0]
+    for v in variables:
+        stride = strides.get(v, 0)
+        indices = [i + g * stride for i in indices for g in GENES]
+    return indices
+
+
+ENGINES = {
+    "enumeration": enumeration,
+    "elimination": variable_elimination,
+    "vectorized": vectorized,
+}
+
+SAMPLERS = {
+    "likelihood": likelihood_weighting,
+    "gibbs": gibbs_sampling,
+}
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,154 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from crossword import Crossword
+from generate import CrosswordCreator
+
+# Options of CrosswordCreator compared by the benchmark; the first is the
+# baseline the others are measured against
+STRATEGIES = {
+    "chronological": dict(backjumping=False, restarts=False),
+    "backjumping": dict(backjumping=True, restarts=False),
+    "backjumping+restarts": dict(backjumping=True, restarts=True),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare nodes and time of crossword search strategies."
+    )
+    parser.add_argument("structures", nargs="*", default=[
+        "data/structure0.txt", "data/structure1.txt", "data/structure2.txt"
+    ])
+    parser.add_argument("--words", default="data/words2.txt")
+    parser.add_argument(
+        "--sizes", type=int, nargs="*", default=[7, 9, 11],
+        help="sizes of random square structures to generate"
+    )
+    parser.add_argument(
+        "--grids", type=int, default=4,
+        help="number of random structures of each size"
+    )
+    parser.add_argument(
+        "--blocks", type=float, default=0.2,
+        help="fraction of cells to block in random structures"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30,
+        help="seconds to give each search"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--json", action="store_true",
+        help="print one JSON object per measurement"
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    records = []
+    with tempfile.TemporaryDirectory() as scratch:
+        structures = list(args.structures)
+        for size in args.sizes:
+            for n in range(args.grids):
+                filename = os.path.join(scratch, f"random-{size}-{n}.txt")
+                with open(filename, "w") as f:
+                    f.write(random_structure(size, size, args.blocks, rng))
+                structures.append(filename)
+        for structure in structures:
+            records.extend(benchmark_structure(structure, args))
+
+    if args.json:
+        for record in records:
+            print(json.dumps(record))
+    else:
+        print_table(records)
+
+
+def random_structure(height, width, blocks, rng):
+    """
+    Return a random crossword structure with about `blocks` of its cells
+    blocked. Runs of exactly two open cells, which few words fit, are
+    broken up by blocking one of their cells.
+    """
+    grid = [[rng.random() >= blocks for _ in range(width)] for _ in range(height)]
+    while True:
+        cells = short_run(grid)
+        if cells is None:
+            break
+        i, j = rng.choice(cells)
+        grid[i][j] = False
+    return "".join(
+        "".join("_" if cell else "#" for cell in row) + "\n" for row in grid
+    )
+
+
+def short_run(grid):
+    """
+    Return the two cells of a run of exactly two open cells in `grid`,
+    across or down, or None if there is no such run.
+    """
+    height, width = len(grid), len(grid[0])
+
+    def is_open(i, j):
+        return 0 <= i < height and 0 <= j < width and grid[i][j]
+
+    for i in range(height):
+        for j in range(width):
+            for di, dj in ((0, 1), (1, 0)):
+                if (
+                    not is_open(i - di, j - dj) and is_open(i, j) and
+                    is_open(i + di, j + dj) and not is_open(i + 2 * di, j + 2 * dj)
+                ):
+                    return [(i, j), (i + di, j + dj)]
+    return None
+
+
+def benchmark_structure(structure, args):
+    """
+    Search `structure` with every strategy, and return one record each,
+    with the reduction in nodes and seconds from the first strategy.
+    """
+    crossword = Crossword(structure, args.words)
+    info = {
+        "structure": os.path.basename(structure),
+        "variables": len(crossword.variables),
+    }
+    records = []
+    for strategy, options in STRATEGIES.items():
+        creator = CrosswordCreator(
+            crossword, seed=args.seed, timeout=args.timeout, **options
+        )
+        start = time.perf_counter()
+        try:
+            result = "solved" if creator.solve() is not None else "none"
+        except TimeoutError:
+            result = "timeout"
+        seconds = time.perf_counter() - start
+        records.append(dict(
+            info, strategy=strategy, result=result,
+            nodes=creator.nodes, nogoods=len(creator.nogoods), seconds=seconds
+        ))
+
+    baseline = records[0]
+    for record in records:
+        record["node_reduction"] = 1 - record["nodes"] / baseline["nodes"]
+        record["time_reduction"] = 1 - record["seconds"] / baseline["seconds"]
+    return records
+
+
+def print_table(records):
+    print(f"{'structure':<18}{'variables':>10}{'strategy':>22}{'result':>9}"
+          f"{'nodes':>8}{'nogoods':>9}{'seconds':>9}{'-nodes':>8}{'-time':>8}")
+    for r in records:
+        print(f"{r['structure']:<18}{r['variables']:>10}{r['strategy']:>22}"
+              f"{r['result']:>9}{r['nodes']:>8}{r['nogoods']:>9}"
+              f"{r['seconds']:>9.3f}{r['node_reduction']:>8.0%}"
+              f"{r['time_reduction']:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
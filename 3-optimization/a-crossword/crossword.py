@@ -17,7 +17,10 @@ class Variable():
             )
 
     def __hash__(self):
-        return hash((self.i, self.j, self.direction, self.length))
+        # Hash the direction as a bool, since strings hash differently in
+        # every run, which would change the order sets of variables iterate in
+        down = self.direction == Variable.DOWN
+        return hash((self.i, self.j, down, self.length))
 
     def __eq__(self, other):
         return (
@@ -35,6 +38,13 @@ class Variable():
         return f"Variable({self.i}, {self.j}, {direction}, {self.length})"
 
 
+class Overlaps(dict):
+    """Overlaps of pairs of variables, None for pairs that do not overlap."""
+
+    def __missing__(self, key):
+        return None
+
+
 class Crossword():
 
     def __init__(self, structure_file, words_file):
@@ -61,6 +71,24 @@ class Crossword():
         with open(words_file) as f:
             self.words = set(f.read().upper().splitlines())
 
+        # Number the words, and index them as bitsets of word numbers:
+        # by length, and by length, position and letter at that position
+        self.lexicon = sorted(self.words)
+        self.numbers = {word: n for n, word in enumerate(self.lexicon)}
+        self.alphabet = sorted(set("".join(self.lexicon)))
+        members = dict()
+        for n, word in enumerate(self.lexicon):
+            members.setdefault(len(word), []).append(n)
+            for k, letter in enumerate(word):
+                members.setdefault((len(word), k, letter), []).append(n)
+        self.lengths = dict()
+        self.index = dict()
+        for key, ns in members.items():
+            if isinstance(key, int):
+                self.lengths[key] = bitset(ns)
+            else:
+                self.index[key] = bitset(ns)
+
         # Determine variable set
         self.variables = set()
         for i in range(self.height):
@@ -108,26 +136,56 @@ class Crossword():
         # For any pair of variables v1, v2, their overlap is either:
         #    None, if the two variables do not overlap; or
         #    (i, j), where v1's ith character overlaps v2's jth character
-        self.overlaps = dict()
-        for v1 in self.variables:
-            for v2 in self.variables:
-                if v1 == v2:
-                    continue
-                cells1 = v1.cells
-                cells2 = v2.cells
-                intersection = set(cells1).intersection(cells2)
-                if not intersection:
-                    self.overlaps[v1, v2] = None
-                else:
-                    intersection = intersection.pop()
-                    self.overlaps[v1, v2] = (
-                        cells1.index(intersection),
-                        cells2.index(intersection)
-                    )
+        # Only overlapping pairs are stored, found through the cells
+        # that each variable covers
+        covering = dict()
+        for var in self.variables:
+            for k, cell in enumerate(var.cells):
+                covering.setdefault(cell, []).append((var, k))
+        self.overlaps = Overlaps()
+        self.adjacency = {var: set() for var in self.variables}
+        for crossing in covering.values():
+            for v1, k1 in crossing:
+                for v2, k2 in crossing:
+                    if v1 != v2:
+                        self.overlaps[v1, v2] = (k1, k2)
+                        self.adjacency[v1].add(v2)
+        self.adjacency = {
+            var: frozenset(neighbors)
+            for var, neighbors in self.adjacency.items()
+        }
+        self.degree = {
+            var: len(neighbors) for var, neighbors in self.adjacency.items()
+        }
 
     def neighbors(self, var):
         """Given a variable, return set of overlapping variables."""
-        return set(
-            v for v in self.variables
-            if v != var and self.overlaps[v, var]
-        )
+        return self.adjacency[var]
+
+    def decode(self, words):
+        """Given a bitset of word numbers, return the list of its words."""
+        # Sparse bitsets, as domains are deep in the search, are cheaper
+        # to take apart one bit at a time than by their binary string
+        if words.bit_count() * 16 < len(self.lexicon):
+            decoded = []
+            while words:
+                low = words & -words
+                decoded.append(self.lexicon[low.bit_length() - 1])
+                words ^= low
+            return decoded
+        return [
+            self.lexicon[n]
+            for n, bit in enumerate(reversed(bin(words)[2:]))
+            if bit == "1"
+        ]
+
+
+def bitset(numbers):
+    """Return the integer whose set bits are the given `numbers`."""
+    numbers = list(numbers)
+    if not numbers:
+        return 0
+    bits = bytearray(max(numbers) // 8 + 1)
+    for n in numbers:
+        bits[n // 8] |= 1 << (n % 8)
+    return int.from_bytes(bits, "little")
@@ -1,19 +1,155 @@
+import random
 import sys
+import time
 
 from crossword import *
 
+# Search nodes before the first restart, and the growth of that limit
+RESTART_NODES = 100
+RESTART_GROWTH = 1.5
 
-class CrosswordCreator():
+# Most nogoods kept at once; the oldest are forgotten first
+NOGOODS = 10000
+
+# Seed of the tie-breaks drawn at restarts when no seed is given, so that
+# the same crossword is always searched the same way
+SEED = 0
+
+
+class Restart(Exception):
+    """Raised by `search` when the node limit of the current run is spent."""
+
+
+class SearchState():
+    """
+    Partial assignment of words to crossword variables, changed in place
+    as the search goes deeper and undone as it backtracks.
+    """
 
     def __init__(self, crossword):
+        self.assignment = dict()
+        self.used = set()
+
+        # Position of each assigned variable in the order of assignment
+        self.depths = dict()
+
+        # Letter in each cell, and the number of assigned words covering it
+        self.letters = [[None] * crossword.width for _ in range(crossword.height)]
+        self.counts = [[0] * crossword.width for _ in range(crossword.height)]
+
+        # Cells that each variable shares with another, with the position
+        # of the cell in the variable
+        self.crossings = {
+            var: sorted({
+                (k, *var.cells[k])
+                for k, _ in (
+                    crossword.overlaps[var, other]
+                    for other in crossword.neighbors(var)
+                )
+            })
+            for var in crossword.variables
+        }
+
+    def fits(self, var, word):
+        """
+        Return True if `word` is not used yet and agrees with the letters
+        already in the cells that `var` shares with other variables.
+        """
+        if word in self.used:
+            return False
+        letters = self.letters
+        for k, i, j in self.crossings[var]:
+            if letters[i][j] is not None and letters[i][j] != word[k]:
+                return False
+        return True
+
+    def assign(self, var, word):
+        """
+        Assign `word` to `var`, writing its letters into the grid.
+        """
+        self.depths[var] = len(self.assignment)
+        self.assignment[var] = word
+        self.used.add(word)
+        for k, i, j in self.crossings[var]:
+            self.letters[i][j] = word[k]
+            self.counts[i][j] += 1
+
+    def unassign(self, var):
+        """
+        Undo the assignment of `var`, clearing the cells no other
+        assigned word covers.
+        """
+        self.used.discard(self.assignment.pop(var))
+        del self.depths[var]
+        for k, i, j in self.crossings[var]:
+            self.counts[i][j] -= 1
+            if not self.counts[i][j]:
+                self.letters[i][j] = None
+
+
+class CrosswordCreator():
+
+    def __init__(self, crossword, backjumping=True, restarts=True,
+                 seed=None, timeout=None):
         """
         Create new CSP crossword generate.
+
+        With `backjumping`, a failed search jumps back to the latest
+        assignment in its conflict set and learns the conflict as a
+        nogood; without it, search backtracks chronologically. With
+        `restarts`, search starts over after a growing number of nodes,
+        breaking ties in variable ordering at random from `seed`, or from
+        SEED if there is none. With a `seed`, ties in value ordering are
+        broken at random as well, so that differently seeded searches
+        explore different trees. Search raises TimeoutError after
+        `timeout` seconds.
         """
         self.crossword = crossword
+        # Variables in reading order, so that every run visits them alike
+        self.variables = sorted(
+            self.crossword.variables, key=lambda v: (v.i, v.j, v.direction)
+        )
+
+        # Domains are bitsets of the numbers of words in the lexicon
+        everything = (1 << len(self.crossword.lexicon)) - 1
         self.domains = {
-            var: self.crossword.words.copy()
-            for var in self.crossword.variables
+            var: everything
+            for var in self.variables
+        }
+
+        # Domains replaced during search, as (variable, old domain,
+        # old culprits) triples
+        self.trail = []
+
+        # Depths of the assignments that removed words from each domain,
+        # as bitsets, and the conflict set of the last wiped-out domain
+        self.culprits = {var: 0 for var in self.crossword.variables}
+        self.conflict = 0
+
+        # Failing partial assignments, as frozensets of (variable, word)
+        # pairs in the order they were learned, and the nogoods each pair
+        # is part of, also in the order they were learned
+        self.nogoods = dict()
+        self.watches = dict()
+
+        self.backjumping = backjumping
+        self.restarts = restarts
+        self.timeout = timeout
+        self.deadline = None
+        self.limit = None
+
+        # Tie-breaks in variable ordering: the variables in reading order,
+        # until random ones are drawn at a restart, or at once with a seed
+        self.priority = {
+            var: -n for n, var in enumerate(self.variables)
         }
+        self.random = random.Random(SEED if seed is None else seed)
+        self.seeded = seed is not None
+        if self.seeded:
+            self.shuffle()
+
+        # Number of search nodes visited by `backtrack`
+        self.nodes = 0
 
     def letter_grid(self, assignment):
         """
@@ -101,8 +237,7 @@ class CrosswordCreator():
          constraints; in this case, the length of the word.)
         """
         for var, words in list(self.domains.items()):
-            self.domains[var] = {
-                word for word in words if len(word) == var.length}
+            self.domains[var] = words & self.crossword.lengths.get(var.length, 0)
 
     def revise(self, x, y):
         """
@@ -113,17 +248,44 @@ class CrosswordCreator():
         Return True if a revision was made to the domain of `x`; return
         False if no revision was made.
         """
-        revised = False
         if not self.crossword.overlaps[x, y]:
-            return revised
+            return False
 
         x_idx, y_idx = self.crossword.overlaps[x, y]
 
-        for x_word in list(self.domains[x]):
-            if len([y_word for y_word in self.domains[y] if y_word[y_idx] == x_word[x_idx]]) == 0:
-                self.domains[x].remove(x_word)
-                revised = True
-        return revised
+        # Words of `x` whose overlapping letter some word of `y` has
+        index = self.crossword.index
+        x_words, y_words = self.domains[x], self.domains[y]
+        x_length, y_length = x.length, y.length
+        supported = 0
+        for letter in self.crossword.alphabet:
+            if y_words & index.get((y_length, y_idx, letter), 0):
+                supported |= index.get((x_length, x_idx, letter), 0)
+
+        revised = x_words & supported
+        if revised == x_words:
+            return False
+        self.reduce(x, revised, self.culprits[x] | self.culprits[y])
+        return True
+
+    def reduce(self, var, words, culprits=0):
+        """
+        Replace the domain of `var` with `words`, and its culprits with
+        `culprits`, keeping the old ones on the trail so that `undo` can
+        restore them.
+        """
+        self.trail.append((var, self.domains[var], self.culprits[var]))
+        self.domains[var] = words
+        self.culprits[var] = culprits
+
+    def undo(self, mark):
+        """
+        Restore every domain replaced since the trail had length `mark`.
+        """
+        while len(self.trail) > mark:
+            var, words, culprits = self.trail.pop()
+            self.domains[var] = words
+            self.culprits[var] = culprits
 
     def remove_duplicateds(self):
         """
@@ -136,10 +298,10 @@ class CrosswordCreator():
         """
         duplicated_removed = False
         for var, words in list(self.domains.items()):
-            if len(words) == 1:
+            if words.bit_count() == 1:
                 for v2, w2 in list(self.domains.items()):
-                    if v2 is not var and list(words)[0] in w2:
-                        self.domains[v2].remove(list(words)[0])
+                    if v2 is not var and words & w2:
+                        self.domains[v2] &= ~words
                         duplicated_removed = True
         return duplicated_removed
 
@@ -150,19 +312,25 @@ class CrosswordCreator():
         Otherwise, use `arcs` as the initial list of arcs to make consistent.
 
         Return True if arc consistency is enforced and no domains are empty;
-        return False if one or more domains end up empty.
+        return False if one or more domains end up empty, leaving the
+        culprits of the empty domain in `self.conflict`.
         """
         if arcs is None:
             arcs = [(var, neighbor)
                     for var in self.domains for neighbor in self.crossword.neighbors(var)]
 
+        # Arcs waiting in `arcs`, which are not queued again
+        queued = set(arcs)
         while arcs:
             x, y = arcs.pop()
+            queued.discard((x, y))
             if self.revise(x, y):
-                if len(self.domains[x]) == 0:
+                if not self.domains[x]:
+                    self.conflict = self.culprits[x]
                     return False
                 for z in self.crossword.neighbors(x):
-                    if z is not y:
+                    if z is not y and (z, x) not in queued:
+                        queued.add((z, x))
                         arcs.append((z, x))
             # if not arcs:
             #     if self.remove_duplicateds():
@@ -183,11 +351,13 @@ class CrosswordCreator():
         Return True if `assignment` is consistent (i.e., words fit in crossword
         puzzle without conflicting characters); return False otherwise.
         """
-        assignment_list = list(assignment.items())
-        if not assignment_list:
+        if not assignment:
             return True
-        last_var, last_word = assignment_list[-1]
-        for var, word in assignment_list[:-1]:
+        last_var = next(reversed(assignment))
+        last_word = assignment[last_var]
+        for var, word in assignment.items():
+            if var is last_var:
+                continue
             if len(word) != var.length or last_word is word:
                 return False
             if not self.crossword.overlaps[last_var, var]:
@@ -206,42 +376,36 @@ class CrosswordCreator():
         """
         if not var:
             return []
-        neighbors = self.crossword.neighbors(var)
-        words = self.domains[var]
-        word_count = {word: 0 for word in words}
-        for n in neighbors:
-            for word in self.domains[n].intersection(words):
-                word_count[word] += 1
-        return sorted(word_count.keys(), key=lambda w: word_count[w])
-
-    def get_from_neighbors(self, variable, assignment):
-        '''
-        Retrieve neighbors from a variable to fill next word.
-        '''
-        neighbors = self.crossword.neighbors(variable)
-        temp_domains = dict()
-        for n in neighbors:
-            temp_domains[n] = self.domains[n]
-        grouped_domains = self.group_by_min_remain(temp_domains)
-        for l, domains in grouped_domains:
-            sorted_domains = self.sort_by_highest_neighbors(domains)
-            for v in [i for i, d in sorted_domains if i not in assignment.keys()]:
-                return v
-        return None
+        index = self.crossword.index
 
-    def group_by_min_remain(self, domains):
-        grouped_by_min_remain_val = dict()
-        for item in domains.items():
-            l = len(item[1])
-            if l not in grouped_by_min_remain_val:
-                grouped_by_min_remain_val[l] = [item]
-            else:
-                grouped_by_min_remain_val[l].append(item)
+        # For each unassigned neighbor, the position of the overlap in
+        # `var`, and the values each letter there rules out of its domain
+        ruled_out = []
+        for n in self.crossword.neighbors(var):
+            if n in assignment:
+                continue
+            k, l = self.crossword.overlaps[var, n]
+            words = self.domains[n]
+            total = words.bit_count()
+            ruled_out.append((k, {
+                letter: total - (words & index.get((n.length, l, letter), 0)).bit_count()
+                for letter in self.crossword.alphabet
+            }))
+
+        values = self.crossword.decode(self.domains[var])
+        if self.seeded:
+            self.random.shuffle(values)
         return sorted(
-            grouped_by_min_remain_val.items(), key=lambda g: g[0])
+            values,
+            key=lambda w: sum(counts[w[k]] for k, counts in ruled_out)
+        )
 
-    def sort_by_highest_neighbors(self, domains):
-        return sorted(domains, key=lambda d: len(self.crossword.neighbors(d[0])), reverse=True)
+    def shuffle(self):
+        """
+        Draw new random tie-breaks for variable ordering, in a fixed order
+        of the variables so that a seed gives the same search every run.
+        """
+        self.priority = {var: self.random.random() for var in self.variables}
 
     def select_unassigned_variable(self, assignment):
         """
@@ -250,26 +414,72 @@ class CrosswordCreator():
         in its domain. If there is a tie, choose the variable with the highest
         degree. If there is a tie, any of the tied variables are acceptable
         return values.
+
+        Neighbors of the most recently assigned variables come first, so
+        that the grid fills outwards from the words already placed.
         """
-        if assignment:
-            for i in [(idx * -1) for idx in range(1, len(list(assignment))+1)]:
-                last_item = list(assignment)[i]
-                result = self.get_from_neighbors(last_item, assignment)
-                if result:
-                    return result
-
-        grouped_by_min_remain_val = self.group_by_min_remain(self.domains)
-        for l, domains in grouped_by_min_remain_val:
-            # sort all domains by highest neighbors.
-            domains = self.sort_by_highest_neighbors(domains)
-            # return variable that is not already assigned.
-            for domain in domains:
-                if domain[0] not in list(assignment.keys()):
-                    return domain[0]
-        return None
+        for last_item in reversed(assignment):
+            result = self.most_constrained(
+                self.crossword.neighbors(last_item), assignment
+            )
+            if result is not None:
+                return result
+        return self.most_constrained(self.domains, assignment)
+
+    def most_constrained(self, variables, assignment):
+        """
+        Return the unassigned variable of `variables` with the fewest
+        remaining values, then the highest degree, then the highest
+        tie-break, in one pass; or None if all are assigned.
+        """
+        best = None
+        for var in variables:
+            if var in assignment:
+                continue
+            key = (
+                self.domains[var].bit_count(),
+                -self.crossword.degree[var],
+                -self.priority[var],
+            )
+            if best is None or key < best_key:
+                best, best_key = var, key
+        return best
 
     def inferences(self, assignment):
-        # TODO: apply know values to assignment.
+        """
+        Maintain arc consistency after the last variable of `assignment`
+        was assigned a word: reduce its domain to that word, remove the
+        word from every other unassigned domain, and run `ac3` on the
+        arcs into the variables that changed.
+
+        Every domain reduction goes on the trail, blaming the depth of
+        the assignment along with the culprits of the domains it was
+        revised against. Return a dictionary of new assignments, which is
+        always empty, or None if a domain ended up empty, leaving its
+        culprits in `self.conflict`.
+        """
+        var = next(reversed(assignment))
+        word = 1 << self.crossword.numbers[assignment[var]]
+        cause = 1 << (len(assignment) - 1)
+        self.reduce(var, word, cause)
+
+        changed = [var]
+        for other, words in self.domains.items():
+            if other is not var and other not in assignment and words & word:
+                if words == word:
+                    self.conflict = self.culprits[other] | cause
+                    return None
+                self.reduce(other, words & ~word, self.culprits[other] | cause)
+                changed.append(other)
+
+        arcs = [
+            (neighbor, x)
+            for x in changed
+            for neighbor in self.crossword.neighbors(x)
+            if neighbor not in assignment
+        ]
+        if not self.ac3(arcs):
+            return None
         return dict()
 
     def backtrack(self, assignment):
@@ -281,25 +491,121 @@ class CrosswordCreator():
 
         If no assignment is possible, return None.
         """
-        if self.assignment_complete(assignment):
-            return assignment
-        var = self.select_unassigned_variable(assignment)
-        inferences = dict()
-        for value in self.order_domain_values(var, assignment):
-            new_assignment = assignment.copy()
-            new_assignment[var] = value
-            if self.consistent(new_assignment):
-                assignment[var] = value
-                inferences = self.inferences(assignment)
-                if inferences:
-                    assignment.update(inferences)
-                result = self.backtrack(new_assignment)
-                if result is not None:
-                    return result
-            assignment = {key: value for key, value in assignment.items(
-            ) if key is not var and key not in inferences.keys()}
+        if self.timeout is not None:
+            self.deadline = time.monotonic() + self.timeout
+        mark = len(self.trail)
+        limit = RESTART_NODES
+        while True:
+            state = SearchState(self.crossword)
+            for var, word in assignment.items():
+                state.assign(var, word)
+            self.limit = self.nodes + limit if self.restarts else None
+            try:
+                conflict = self.search(state)
+            except Restart:
+                # Start over with new tie-breaks, keeping the nogoods
+                self.undo(mark)
+                self.shuffle()
+                limit = int(limit * RESTART_GROWTH)
+                continue
+            if conflict is None:
+                return dict(state.assignment)
+            return None
+
+    def search(self, state):
+        """
+        Extend the SearchState `state` in place to a complete assignment,
+        and return None, or leave it unchanged and return the conflict set
+        of the failure: a bitset of the depths of the assignments that
+        leave no way to complete `state`.
+
+        When the conflict set of a subtree leaves out the variable
+        assigned here, its other values cannot help, so search jumps back
+        over it at once.
+        """
+        self.nodes += 1
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise TimeoutError("no crossword found before the deadline")
+        if self.limit is not None and self.nodes > self.limit:
+            raise Restart()
+
+        depth = len(state.assignment)
+        if depth == len(self.domains):
+            return None
+        var = self.select_unassigned_variable(state.assignment)
+        bit = 1 << depth
+        earlier = bit - 1
+
+        # Words already removed from the domain are blamed on their culprits
+        conflict = self.culprits[var]
+        for value in self.order_domain_values(var, state.assignment):
+            if not state.fits(var, value):
+                conflict |= earlier
+                continue
+            state.assign(var, value)
+            # Propagate, and backtrack at once if a domain is wiped out
+            mark = len(self.trail)
+            failure = self.violated(state, var, value)
+            if failure is None:
+                if self.inferences(state.assignment) is None:
+                    failure = self.conflict
+                else:
+                    failure = self.search(state)
+                    if failure is None:
+                        return None
+                    if not failure & bit:
+                        self.undo(mark)
+                        state.unassign(var)
+                        return failure
+            conflict |= failure & earlier
+            self.undo(mark)
+            state.unassign(var)
+
+        if not self.backjumping:
+            return earlier
+        self.learn(state, conflict)
+        return conflict
+
+    def violated(self, state, var, value):
+        """
+        Return the depths of the assignments in a nogood that assigning
+        `value` to `var` completes in `state`, or None if there is none.
+        """
+        for nogood in self.watches.get((var, value), ()):
+            if all(state.assignment.get(v) == word for v, word in nogood):
+                conflict = 0
+                for v, _ in nogood:
+                    conflict |= 1 << state.depths[v]
+                return conflict
         return None
 
+    def learn(self, state, conflict):
+        """
+        Record the assignments of `state` at the depths in `conflict` as a
+        nogood, forgetting the oldest nogood beyond NOGOODS.
+        """
+        if not conflict:
+            return
+        order = list(state.assignment)
+        pairs = []
+        while conflict:
+            low = conflict & -conflict
+            var = order[low.bit_length() - 1]
+            pairs.append((var, state.assignment[var]))
+            conflict ^= low
+        nogood = frozenset(pairs)
+        if nogood in self.nogoods:
+            return
+        self.nogoods[nogood] = None
+        for pair in nogood:
+            self.watches.setdefault(pair, dict())[nogood] = None
+
+        if len(self.nogoods) > NOGOODS:
+            oldest = next(iter(self.nogoods))
+            del self.nogoods[oldest]
+            for pair in oldest:
+                del self.watches[pair][oldest]
+
 
 def main():
 
@@ -0,0 +1,121 @@
+import argparse
+import multiprocessing
+import os
+import time
+
+from crossword import Crossword
+from generate import CrosswordCreator
+
+# Options of the searches in a portfolio, taken in turn, each search with
+# its own seed for tie-breaks in variable ordering
+CONFIGURATIONS = [
+    dict(backjumping=True, restarts=True),
+    dict(backjumping=True, restarts=False),
+    dict(backjumping=False, restarts=False),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Race differently configured crossword searches."
+    )
+    parser.add_argument("structure")
+    parser.add_argument("words")
+    parser.add_argument("output", nargs="?")
+    parser.add_argument(
+        "--searches", type=int, default=os.cpu_count() or 1,
+        help="number of searches to run side by side"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=None,
+        help="seconds to wait for any search to finish"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        record = portfolio(
+            args.structure, args.words, args.searches, args.timeout
+        )
+    except TimeoutError:
+        print(f"No search finished in {args.timeout:g} seconds.")
+        return
+    seconds = time.perf_counter() - start
+
+    # Print result
+    if record["assignment"] is None:
+        print("No solution.")
+    else:
+        creator = CrosswordCreator(Crossword(args.structure, args.words))
+        creator.print(record["assignment"])
+        if args.output:
+            creator.save(record["assignment"], args.output)
+    print(f"Search {record['options']} finished in {record['nodes']} nodes "
+          f"and {seconds:.3f} seconds.")
+
+
+def configurations(searches):
+    """
+    Return the options of `searches` searches, going round CONFIGURATIONS
+    with a new seed for each search.
+    """
+    return [
+        dict(CONFIGURATIONS[n % len(CONFIGURATIONS)], seed=n)
+        for n in range(searches)
+    ]
+
+
+def portfolio(structure, words, searches, timeout=None):
+    """
+    Run `searches` differently configured searches of the crossword in
+    `structure` and `words`, each in its own process, and return the
+    record of the first to finish, as returned by `search`. The other
+    searches are terminated.
+
+    Raise TimeoutError if no search finishes within `timeout` seconds.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    tasks = [
+        (structure, words, options, timeout)
+        for options in configurations(searches)
+    ]
+
+    # Leaving the pool terminates the searches still running
+    with multiprocessing.Pool(len(tasks)) as pool:
+        records = pool.imap_unordered(search, tasks)
+        for _ in tasks:
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0)
+            try:
+                record = records.next(remaining)
+            except multiprocessing.TimeoutError:
+                break
+            if not record["timeout"]:
+                return record
+    raise TimeoutError("no crossword search finished before the deadline")
+
+
+def search(task):
+    """
+    Solve the crossword of a task `(structure, words, options, timeout)`
+    with a CrosswordCreator given `options`, and return a record of the
+    options, the assignment or None, the nodes visited, and whether the
+    search ran out of time.
+    """
+    structure, words, options, timeout = task
+    creator = CrosswordCreator(
+        Crossword(structure, words), timeout=timeout, **options
+    )
+    try:
+        assignment, timed_out = creator.solve(), False
+    except TimeoutError:
+        assignment, timed_out = None, True
+    return {
+        "options": options, "assignment": assignment,
+        "nodes": creator.nodes, "timeout": timed_out,
+    }
+
+
+if __name__ == "__main__":
+    main()